@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import ssl
+
+import certifi
+import httpx
+
+
+_ssl_contexts: dict[bool, ssl.SSLContext] = {}
+
+
+def get_ssl_context(*, http2: bool = False) -> ssl.SSLContext:
+    """
+    Process-wide SSL context shared by outbound httpx clients.
+    Loading the CA bundle is the expensive part of building a client, so do it once.
+
+    httpx uses a passed-in context as-is and only sets ALPN on contexts it builds
+    itself, so the protocols to offer are set here: "h2" only when the client was
+    created with http2=True, otherwise a server could pick h2 for an HTTP/1.1 client.
+    """
+    ctx = _ssl_contexts.get(http2)
+    if ctx is None:
+        ctx = ssl.create_default_context(cafile=certifi.where())
+        ctx.set_alpn_protocols(["h2", "http/1.1"] if http2 else ["http/1.1"])
+        _ssl_contexts[http2] = ctx
+    return ctx
+
+
+def new_http_client(*, timeout: float, http2: bool = False) -> httpx.Client:
+    """
+    http2=True negotiates HTTP/2 via ALPN where the server supports it (Zoho and Slack
+    do; httpx falls back to HTTP/1.1 otherwise). Each client owns its own connection
+    pool, so requests only share a connection within one `with new_http_client(...)` block.
+    """
+    return httpx.Client(timeout=timeout, verify=get_ssl_context(http2=http2), http2=http2)
@@ -3,8 +3,7 @@ from __future__ import annotations
 import logging
 from typing import Any, Optional
 
-import httpx
-
+from app.services.http_client import new_http_client
 from app.settings import get_settings
 
 logger = logging.getLogger(__name__)
@@ -41,7 +40,7 @@ def send_slack_alert(
     payload: dict[str, Any] = {"text": text}
 
     try:
-        with httpx.Client(timeout=10.0) as client:
+        with new_http_client(timeout=10.0, http2=True) as client:
             resp = client.post(settings.SLACK_WEBHOOK_URL, json=payload)
             resp.raise_for_status()
             return True
@@ -95,25 +94,25 @@ def _convert_blocks_to_attachments(text: str, blocks: list[dict[str, Any]]) -> d
     return {"text": text, "attachments": [attachment]}
 
 
-def _format_text_message(
-    title: str,
-    message: str,
-    fields: Optional[list[dict[str, str]]] = None,
-) -> str:
+def _format_fast(title: str, message: str, *kv_pairs: tuple[str, str]) -> str:
     """
     Format a message as markdown text for maximum compatibility.
-    Uses Slack's markdown syntax for formatting.
+    Uses Slack's markdown syntax for formatting; kv_pairs are (title, value) field tuples.
     """
-    lines = [f"*{title}*", "", message]
-    
-    if fields:
-        lines.append("")
-        for field in fields:
-            # Format field with bold title and value
-            value = field.get('value', 'N/A')
-            lines.append(f"*{field['title']}*: {value}")
-    
-    return "\n".join(lines)
+    text = f"*{title}*\n\n{message}"
+    if kv_pairs:
+        text += "\n\n" + "\n".join([f"*{label}*: {value}" for label, value in kv_pairs])
+    return text
+
+
+def _send_fields_event(title: str, message: str, *kv_pairs: tuple[str, str]) -> bool:
+    settings = get_settings()
+    if not settings.SLACK_WEBHOOK_URL:
+        logger.debug("Slack webhook not configured; skipping event: %s", title)
+        return False
+
+    # Always use markdown text format for maximum compatibility
+    return send_slack_alert(text=_format_fast(title, message, *kv_pairs))
 
 
 def send_slack_event(
@@ -134,18 +133,14 @@ def send_slack_event(
         message: Main message text (supports markdown)
         color: Attachment color ("good", "warning", "danger") - used if format mode supports it
         fields: Optional list of field dicts with "title" and "value" keys
+            (deprecated; the notify_* helpers pass (title, value) tuples directly)
     
     Returns:
         True if message was sent successfully, False otherwise
     """
-    settings = get_settings()
-    if not settings.SLACK_WEBHOOK_URL:
-        logger.debug("Slack webhook not configured; skipping event: %s", title)
-        return False
-
-    # Always use markdown text format for maximum compatibility
-    text = _format_text_message(title, message, fields)
-    return send_slack_alert(text=text)
+    return _send_fields_event(
+        title, message, *[(field["title"], field.get("value", "N/A")) for field in fields or ()]
+    )
 
 
 # Convenience functions for common events
@@ -159,19 +154,18 @@ def notify_demo_booked(
 ) -> None:
     """Send notification when a new demo is booked via Calendly."""
     fields = [
-        {"title": "Email", "value": email},
-        {"title": "Name", "value": name or "N/A"},
-        {"title": "Company", "value": company or "N/A"},
-        {"title": "Demo Date", "value": demo_datetime or "N/A"},
+        ("Email", email),
+        ("Name", name or "N/A"),
+        ("Company", company or "N/A"),
+        ("Demo Date", demo_datetime or "N/A"),
     ]
     if lead_id:
-        fields.append({"title": "Zoho Lead ID", "value": lead_id})
+        fields.append(("Zoho Lead ID", lead_id))
 
-    send_slack_event(
-        title="🎯 New Demo Booked",
-        message=f"*{name or email}* from *{company or 'Unknown'}* has booked a demo.",
-        color="good",
-        fields=fields,
+    _send_fields_event(
+        "🎯 New Demo Booked",
+        f"*{name or email}* from *{company or 'Unknown'}* has booked a demo.",
+        *fields,
     )
 
 
@@ -184,18 +178,17 @@ def notify_demo_canceled(
 ) -> None:
     """Send notification when a demo is canceled."""
     fields = [
-        {"title": "Email", "value": email},
-        {"title": "Name", "value": name or "N/A"},
-        {"title": "Company", "value": company or "N/A"},
+        ("Email", email),
+        ("Name", name or "N/A"),
+        ("Company", company or "N/A"),
     ]
     if lead_id:
-        fields.append({"title": "Zoho Lead ID", "value": lead_id})
+        fields.append(("Zoho Lead ID", lead_id))
 
-    send_slack_event(
-        title="❌ Demo Canceled",
-        message=f"*{name or email}* from *{company or 'Unknown'}* has canceled their demo.",
-        color="warning",
-        fields=fields,
+    _send_fields_event(
+        "❌ Demo Canceled",
+        f"*{name or email}* from *{company or 'Unknown'}* has canceled their demo.",
+        *fields,
     )
 
 
@@ -210,22 +203,21 @@ def notify_demo_completed(
 ) -> None:
     """Send notification when a demo meeting is completed (Read.ai)."""
     fields = [
-        {"title": "Email", "value": email},
-        {"title": "Name", "value": name or "N/A"},
-        {"title": "Company", "value": company or "N/A"},
+        ("Email", email),
+        ("Name", name or "N/A"),
+        ("Company", company or "N/A"),
     ]
     if meeting_duration:
-        fields.append({"title": "Duration", "value": f"{meeting_duration} minutes"})
+        fields.append(("Duration", f"{meeting_duration} minutes"))
     if meddic_confidence:
-        fields.append({"title": "MEDDIC Confidence", "value": meddic_confidence})
+        fields.append(("MEDDIC Confidence", meddic_confidence))
     if lead_id:
-        fields.append({"title": "Zoho Lead ID", "value": lead_id})
+        fields.append(("Zoho Lead ID", lead_id))
 
-    send_slack_event(
-        title="✅ Demo Completed",
-        message=f"Demo meeting completed for *{name or email}* from *{company or 'Unknown'}*. MEDDIC analysis added to Zoho.",
-        color="good",
-        fields=fields,
+    _send_fields_event(
+        "✅ Demo Completed",
+        f"Demo meeting completed for *{name or email}* from *{company or 'Unknown'}*. MEDDIC analysis added to Zoho.",
+        *fields,
     )
 
 
@@ -239,18 +231,17 @@ def notify_enrichment_completed(
     """Send notification when lead enrichment is completed."""
     sources_text = ", ".join(data_sources) if data_sources else "None"
     fields = [
-        {"title": "Email", "value": email},
-        {"title": "Company", "value": company or "N/A"},
-        {"title": "Data Sources", "value": sources_text},
+        ("Email", email),
+        ("Company", company or "N/A"),
+        ("Data Sources", sources_text),
     ]
     if lead_id:
-        fields.append({"title": "Zoho Lead ID", "value": lead_id})
+        fields.append(("Zoho Lead ID", lead_id))
 
-    send_slack_event(
-        title="🔍 Lead Enrichment Complete",
-        message=f"Auto-enrichment completed for *{email}* from *{company or 'Unknown'}*.",
-        color="good",
-        fields=fields,
+    _send_fields_event(
+        "🔍 Lead Enrichment Complete",
+        f"Auto-enrichment completed for *{email}* from *{company or 'Unknown'}*.",
+        *fields,
     )
 
 
@@ -267,28 +258,27 @@ def notify_support_qualified(
     """Send notification when an Intercom contact is qualified for sales."""
     tags_text = ", ".join(tags) if tags else "N/A"
     fields = [
-        {"title": "Email", "value": email},
-        {"title": "Name", "value": name or "N/A"},
-        {"title": "Company", "value": company or "N/A"},
-        {"title": "Qualifying Tags", "value": tags_text},
+        ("Email", email),
+        ("Name", name or "N/A"),
+        ("Company", company or "N/A"),
+        ("Qualifying Tags", tags_text),
     ]
 
     # Add location if available
     if location:
-        fields.append({"title": "Location", "value": location})
+        fields.append(("Location", location))
 
     # Add plan type if available (valuable context)
     if plan_type:
-        fields.append({"title": "Plan Type", "value": plan_type})
+        fields.append(("Plan Type", plan_type))
 
     if lead_id:
-        fields.append({"title": "Zoho Lead ID", "value": lead_id})
+        fields.append(("Zoho Lead ID", lead_id))
 
-    send_slack_event(
-        title="🎯 Support Contact Qualified",
-        message=f"*{name or email}* from *{company or 'Unknown'}* has been qualified from Intercom support.",
-        color="good",
-        fields=fields,
+    _send_fields_event(
+        "🎯 Support Contact Qualified",
+        f"*{name or email}* from *{company or 'Unknown'}* has been qualified from Intercom support.",
+        *fields,
     )
 
 
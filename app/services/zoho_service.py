@@ -9,6 +9,7 @@ from urllib.parse import quote
 
 import httpx
 
+from app.services.http_client import new_http_client
 from app.settings import get_settings
 
 logger = logging.getLogger(__name__)
@@ -76,7 +77,7 @@ def _refresh_access_token() -> ZohoToken:
         "grant_type": "refresh_token",
     }
 
-    with httpx.Client(timeout=20.0) as client:
+    with new_http_client(timeout=20.0, http2=True) as client:
         resp = client.post(_token_url(), data=data)
         try:
             resp.raise_for_status()
@@ -148,7 +149,7 @@ def _headers() -> dict[str, str]:
 
 def _request(method: str, path: str, *, json_body: Optional[dict[str, Any]] = None) -> dict[str, Any]:
     url = f"{_api_base()}{path}"
-    with httpx.Client(timeout=30.0) as client:
+    with new_http_client(timeout=30.0, http2=True) as client:
         resp = client.request(method, url, headers=_headers(), json=json_body)
         resp.raise_for_status()
         # Zoho search endpoints may return 204 No Content when no records match.
@@ -222,9 +223,10 @@ def create_lead(payload: dict[str, Any]) -> str:
 
     # Log what we're sending
     logger.info("📤 Creating Zoho Lead with %d fields: %s", len(payload), list(payload.keys()))
-    for key, value in payload.items():
-        if key != "Email":  # Email is always there
-            logger.debug("   - %s: %s", key, (str(value)[:100] + "..." if isinstance(value, str) and len(str(value)) > 100 else value))
+    if logger.isEnabledFor(logging.DEBUG):
+        for key, value in payload.items():
+            if key != "Email":  # Email is always there
+                logger.debug("   - %s: %s", key, (value[:100] + "..." if isinstance(value, str) and len(value) > 100 else value))
     
     body = _request("POST", f"/{settings.ZOHO_LEADS_MODULE}", json_body={"data": [payload]})
     logger.debug("Zoho create_lead response: %s", body)
@@ -262,8 +264,9 @@ def update_lead(lead_id: str, payload: dict[str, Any]) -> dict[str, Any]:
 
     # Log what we're sending
     logger.info("📤 Updating Zoho Lead %s with %d fields: %s", lead_id, len(payload), list(payload.keys()))
-    for key, value in payload.items():
-        logger.debug("   - %s: %s", key, (str(value)[:100] + "..." if isinstance(value, str) and len(str(value)) > 100 else value))
+    if logger.isEnabledFor(logging.DEBUG):
+        for key, value in payload.items():
+            logger.debug("   - %s: %s", key, (value[:100] + "..." if isinstance(value, str) and len(value) > 100 else value))
     
     response = _request("PUT", f"/{settings.ZOHO_LEADS_MODULE}/{lead_id}", json_body={"data": [payload]})
     
@@ -392,7 +395,7 @@ def upload_lead_photo(lead_id: str, image_data: bytes, filename: str = "logo.png
 
         logger.info("📷 Uploading photo to Zoho Lead %s (%d bytes)", lead_id, len(image_data))
 
-        with httpx.Client(timeout=30.0) as client:
+        with new_http_client(timeout=30.0, http2=True) as client:
             resp = client.post(url, files=files, headers=headers)
             resp.raise_for_status()
             result = resp.json()
@@ -1,153 +1,227 @@
 from __future__ import annotations
 
 import logging
+import os
 import sys
-from typing import Optional
-
-from pydantic import Field, field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from dataclasses import dataclass, fields
+from functools import cache
+from pathlib import Path
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
-
-class Settings(BaseSettings):
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
-
+_TRUE_VALUES = frozenset({"1", "true", "t", "yes", "y", "on"})
+_FALSE_VALUES = frozenset({"0", "false", "f", "no", "n", "off"})
+
+# validate_configuration() checks, in reporting order.
+_REQUIRED_WHEN_LIVE = ("GEMINI_API_KEY", "ZOHO_CLIENT_ID", "ZOHO_CLIENT_SECRET", "ZOHO_REFRESH_TOKEN")
+_ZOHO_DCS = ("us", "au", "eu", "in")
+_UNSET_WARNINGS = (
+    ("CALENDLY_SIGNING_KEY", "Calendly webhooks will not be authenticated"),
+    ("READAI_SHARED_SECRET", "Read.ai webhooks will not be authenticated"),
+    ("SLACK_WEBHOOK_URL", "failure alerts will not be sent"),
+)
+_CRITICAL_ZCF_FIELDS = ("ZCF_DEMO_DATETIME", "ZCF_LEAD_INTEL", "ZCF_MEDDIC_METRICS")
+
+
+def _load_dotenv(path: str) -> dict[str, str]:
+    """
+    Minimal .env reader: KEY=VALUE lines, '#' comments, optional 'export ' prefix,
+    matching surrounding quotes. Keys are upper-cased like env var lookups below.
+    """
+    try:
+        text = Path(path).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return {}
+
+    env: dict[str, str] = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        key = key.strip()
+        if key.startswith("export "):
+            key = key[len("export "):].strip()
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        elif " #" in value:
+            value = value.split(" #", 1)[0].rstrip()
+        env[key.upper()] = value
+    return env
+
+
+def _coerce(name: str, type_name: str, raw: str) -> Any:
+    if type_name == "bool":
+        lowered = raw.strip().lower()
+        if lowered in _TRUE_VALUES:
+            return True
+        if lowered in _FALSE_VALUES:
+            return False
+        raise ValueError(f"{name} must be a boolean (got: {raw!r})")
+    if type_name == "int":
+        try:
+            return int(raw.strip())
+        except ValueError:
+            raise ValueError(f"{name} must be an integer (got: {raw!r})") from None
+    return raw
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     # Core
-    ENV: str = Field(default="dev")  # dev|prod
-    LOG_LEVEL: str = Field(default="INFO")  # INFO|DEBUG
-    BASE_URL: str = Field(default="http://localhost:8000")
+    ENV: str = "dev"  # dev|prod
+    LOG_LEVEL: str = "INFO"  # INFO|DEBUG
+    BASE_URL: str = "http://localhost:8000"
 
     # Dev-only
-    ALLOW_DEBUG_ENDPOINTS: bool = Field(default=False)
+    ALLOW_DEBUG_ENDPOINTS: bool = False
 
     # Redis / Queue
-    REDIS_URL: str = Field(default="redis://redis:6379/0")
-    RQ_QUEUE_NAME: str = Field(default="default")
+    REDIS_URL: str = "redis://redis:6379/0"
+    RQ_QUEUE_NAME: str = "default"
 
     # DRY_RUN (avoid writing to Zoho)
-    DRY_RUN: bool = Field(default=True)
+    DRY_RUN: bool = True
 
     # Zoho CRM
-    ZOHO_DC: str = Field(default="au")  # au|us|eu|in
-    ZOHO_CLIENT_ID: str = Field(default="")
-    ZOHO_CLIENT_SECRET: str = Field(default="")
-    ZOHO_REFRESH_TOKEN: str = Field(default="")
+    ZOHO_DC: str = "au"  # au|us|eu|in
+    ZOHO_CLIENT_ID: str = ""
+    ZOHO_CLIENT_SECRET: str = ""
+    ZOHO_REFRESH_TOKEN: str = ""
     # Only needed once to exchange a Self Client grant token into a refresh token.
-    ZOHO_REDIRECT_URI: str = Field(default="")
-    ZOHO_LEADS_MODULE: str = Field(default="Leads")
-    ZOHO_OWNER_ID: str = Field(default="")
-    ZOHO_LEAD_STATUS_FIELD: str = Field(default="Lead_Status")
-    STATUS_DEMO_BOOKED: str = Field(default="Demo Booked")
-    STATUS_DEMO_COMPLETE: str = Field(default="Demo Complete")
-    STATUS_DEMO_CANCELED: str = Field(default="Demo Canceled")
-    STATUS_DEMO_NO_SHOW: str = Field(default="Demo No-show")
+    ZOHO_REDIRECT_URI: str = ""
+    ZOHO_LEADS_MODULE: str = "Leads"
+    ZOHO_OWNER_ID: str = ""
+    ZOHO_LEAD_STATUS_FIELD: str = "Lead_Status"
+    STATUS_DEMO_BOOKED: str = "Demo Booked"
+    STATUS_DEMO_COMPLETE: str = "Demo Complete"
+    STATUS_DEMO_CANCELED: str = "Demo Canceled"
+    STATUS_DEMO_NO_SHOW: str = "Demo No-show"
 
     # Zoho Custom Field API Names (must be set by user)
-    ZCF_DEMO_DATETIME: str = Field(default="")
-    ZCF_DEMO_TIMEZONE: str = Field(default="")
-    ZCF_CALENDLY_INVITEE_URI: str = Field(default="")
-    ZCF_CALENDLY_EVENT_URI: str = Field(default="")
-    ZCF_CALENDLY_QA: str = Field(default="")
-    ZCF_LEAD_INTEL: str = Field(default="")
+    ZCF_DEMO_DATETIME: str = ""
+    ZCF_DEMO_TIMEZONE: str = ""
+    ZCF_CALENDLY_INVITEE_URI: str = ""
+    ZCF_CALENDLY_EVENT_URI: str = ""
+    ZCF_CALENDLY_QA: str = ""
+    ZCF_LEAD_INTEL: str = ""
     
     # Calendly LLM-extracted fields (map to your Zoho custom field API names)
-    ZCF_PAIN_POINTS: str = Field(default="")
-    ZCF_TEAM_MEMBERS: str = Field(default="")
-    ZCF_TOOLS_CURRENTLY_USED: str = Field(default="")
-    ZCF_DEMO_OBJECTIVES: str = Field(default="")
-    ZCF_DEMO_FOCUS_RECOMMENDATION: str = Field(default="")
-    ZCF_DISCOVERY_QUESTIONS: str = Field(default="")
-    ZCF_SALES_REP_CHEAT_SHEET: str = Field(default="")
-    ZCF_COMPANY_TYPE: str = Field(default="")
-    ZCF_COMPANY_DESCRIPTION: str = Field(default="")
-    ZCF_QUALIFICATION_GAPS: str = Field(default="")
-    ZCF_BANT_BUDGET: str = Field(default="")
-    ZCF_BANT_AUTHORITY: str = Field(default="")
-    ZCF_BANT_NEED: str = Field(default="")
-    ZCF_BANT_TIMING: str = Field(default="")
-    ZCF_REFERRED_BY: str = Field(default="")  # Custom field for "Referred by" if different from standard
-    ZCF_MEDDIC_METRICS: str = Field(default="")
-    ZCF_MEDDIC_ECONOMIC_BUYER: str = Field(default="")
-    ZCF_MEDDIC_DECISION_CRITERIA: str = Field(default="")
-    ZCF_MEDDIC_DECISION_PROCESS: str = Field(default="")
-    ZCF_MEDDIC_IDENTIFIED_PAIN: str = Field(default="")
-    ZCF_MEDDIC_CHAMPION: str = Field(default="")
-    ZCF_MEDDIC_COMPETITION: str = Field(default="")
-    ZCF_MEDDIC_CONFIDENCE: str = Field(default="")
+    ZCF_PAIN_POINTS: str = ""
+    ZCF_TEAM_MEMBERS: str = ""
+    ZCF_TOOLS_CURRENTLY_USED: str = ""
+    ZCF_DEMO_OBJECTIVES: str = ""
+    ZCF_DEMO_FOCUS_RECOMMENDATION: str = ""
+    ZCF_DISCOVERY_QUESTIONS: str = ""
+    ZCF_SALES_REP_CHEAT_SHEET: str = ""
+    ZCF_COMPANY_TYPE: str = ""
+    ZCF_COMPANY_DESCRIPTION: str = ""
+    ZCF_QUALIFICATION_GAPS: str = ""
+    ZCF_BANT_BUDGET: str = ""
+    ZCF_BANT_AUTHORITY: str = ""
+    ZCF_BANT_NEED: str = ""
+    ZCF_BANT_TIMING: str = ""
+    ZCF_REFERRED_BY: str = ""  # Custom field for "Referred by" if different from standard
+    ZCF_MEDDIC_METRICS: str = ""
+    ZCF_MEDDIC_ECONOMIC_BUYER: str = ""
+    ZCF_MEDDIC_DECISION_CRITERIA: str = ""
+    ZCF_MEDDIC_DECISION_PROCESS: str = ""
+    ZCF_MEDDIC_IDENTIFIED_PAIN: str = ""
+    ZCF_MEDDIC_CHAMPION: str = ""
+    ZCF_MEDDIC_COMPETITION: str = ""
+    ZCF_MEDDIC_CONFIDENCE: str = ""
 
     # Calendly
-    CALENDLY_SIGNING_KEY: str = Field(default="")
-    CALENDLY_EVENT_TYPE_URI: str = Field(default="")
-    CALENDLY_API_TOKEN: str = Field(default="")
+    CALENDLY_SIGNING_KEY: str = ""
+    CALENDLY_EVENT_TYPE_URI: str = ""
+    CALENDLY_API_TOKEN: str = ""
 
     # Read.ai
-    READAI_SHARED_SECRET: str = Field(default="")
-    READAI_CUSTOMER_DOMAINS: str = Field(default="govisually.com,clockworkstudio.com")
-    READAI_MIN_DURATION_MINUTES: int = Field(default=5)
+    READAI_SHARED_SECRET: str = ""
+    READAI_CUSTOMER_DOMAINS: str = "govisually.com,clockworkstudio.com"
+    READAI_MIN_DURATION_MINUTES: int = 5
 
     # Intercom
-    INTERCOM_API_KEY: str = Field(default="")
-    INTERCOM_ADMIN_ID: str = Field(default="")
-    INTERCOM_WEBHOOK_SECRET: str = Field(default="")
-    INTERCOM_QUALIFYING_TAGS: str = Field(default="Lead", description="Comma-separated list of tags that trigger Zoho lead creation")
-    STATUS_SUPPORT_QUALIFIED: str = Field(default="Qualified", description="Zoho lead status for Intercom qualified leads")
-    ENABLE_AUTO_ENRICH_INTERCOM: bool = Field(default=True, description="Auto-enrich Intercom leads with Apollo + Website")
+    INTERCOM_API_KEY: str = ""
+    INTERCOM_ADMIN_ID: str = ""
+    INTERCOM_WEBHOOK_SECRET: str = ""
+    INTERCOM_QUALIFYING_TAGS: str = "Lead"  # Comma-separated list of tags that trigger Zoho lead creation
+    STATUS_SUPPORT_QUALIFIED: str = "Qualified"  # Zoho lead status for Intercom qualified leads
+    ENABLE_AUTO_ENRICH_INTERCOM: bool = True  # Auto-enrich Intercom leads with Apollo + Website
 
     # LLM (Gemini)
-    LLM_PROVIDER: str = Field(default="gemini")
-    GEMINI_API_KEY: str = Field(default="")
-    GEMINI_MODEL: str = Field(default="gemini-1.5-pro")
+    LLM_PROVIDER: str = "gemini"
+    GEMINI_API_KEY: str = ""
+    GEMINI_MODEL: str = "gemini-1.5-pro"
     # Knowledge Base (shared with gv-proposal-ai)
-    GOVISUALLY_KB_STORE_ID: str = Field(
-        default="",
-        description="File Search Store ID from gv-proposal-ai. Enables knowledge base-enhanced MEDDIC extraction for Read.ai meetings."
-    )
+    # File Search Store ID from gv-proposal-ai. Enables knowledge base-enhanced MEDDIC extraction for Read.ai meetings.
+    GOVISUALLY_KB_STORE_ID: str = ""
 
     # Slack
-    SLACK_WEBHOOK_URL: str = Field(default="")
-    SLACK_FORMAT_MODE: str = Field(
-        default="text",
-        description="Slack message format: 'text' (markdown, default, most compatible), 'blocks' (Block Kit), or 'attachments' (legacy). Note: All notifications now use markdown format regardless of this setting."
-    )
+    SLACK_WEBHOOK_URL: str = ""
+    # Slack message format: 'text' (markdown, default, most compatible), 'blocks' (Block Kit),
+    # or 'attachments' (legacy). Note: All notifications now use markdown format regardless of this setting.
+    SLACK_FORMAT_MODE: str = "text"
 
     # Optional
-    CREATE_FOLLOWUP_TASK: bool = Field(default=False)
+    CREATE_FOLLOWUP_TASK: bool = False
 
     # Redis TTL configuration (in seconds)
-    EVENT_TTL_SECONDS: int = Field(default=30 * 24 * 60 * 60)  # 30 days
-    IDEMPOTENCY_TTL_SECONDS: int = Field(default=90 * 24 * 60 * 60)  # 90 days
+    EVENT_TTL_SECONDS: int = 30 * 24 * 60 * 60  # 30 days
+    IDEMPOTENCY_TTL_SECONDS: int = 90 * 24 * 60 * 60  # 90 days
 
     # Apollo.io
-    APOLLO_API_KEY: str = Field(default="")
-    APOLLO_CACHE_TTL_DAYS: int = Field(default=30)
+    APOLLO_API_KEY: str = ""
+    APOLLO_CACHE_TTL_DAYS: int = 30
 
     # ScraperAPI
-    SCRAPER_API_KEY: str = Field(default="")
-    SCRAPER_MAX_PAGES: int = Field(default=5)
+    SCRAPER_API_KEY: str = ""
+    SCRAPER_MAX_PAGES: int = 5
 
     # BrandFetch API (for company logos)
-    BRAND_FETCH_API: str = Field(default="")
-    BRAND_FETCH_CLIENT_ID: str = Field(default="")
+    BRAND_FETCH_API: str = ""
+    BRAND_FETCH_CLIENT_ID: str = ""
 
     # Enrichment Settings
-    ENABLE_AUTO_ENRICH_CALENDLY: bool = Field(default=False)
-    ENABLE_WEBSITE_SCRAPING: bool = Field(default=True)
-    ENRICH_SECRET_KEY: str = Field(default="")
+    ENABLE_AUTO_ENRICH_CALENDLY: bool = False
+    ENABLE_WEBSITE_SCRAPING: bool = True
+    ENRICH_SECRET_KEY: str = ""
 
     # Apollo Zoho Field Mappings
-    ZCF_APOLLO_JOB_TITLE: str = Field(default="")
-    ZCF_APOLLO_SENIORITY: str = Field(default="")
-    ZCF_APOLLO_DEPARTMENT: str = Field(default="")
-    ZCF_APOLLO_LINKEDIN_URL: str = Field(default="")
-    ZCF_APOLLO_PHONE: str = Field(default="")
-    ZCF_APOLLO_COMPANY_SIZE: str = Field(default="")
-    ZCF_APOLLO_COMPANY_REVENUE: str = Field(default="")
-    ZCF_APOLLO_COMPANY_INDUSTRY: str = Field(default="")
-    ZCF_APOLLO_COMPANY_FOUNDED_YEAR: str = Field(default="")
-    ZCF_APOLLO_COMPANY_FUNDING_STAGE: str = Field(default="")
-    ZCF_APOLLO_COMPANY_FUNDING_TOTAL: str = Field(default="")
-    ZCF_APOLLO_TECH_STACK: str = Field(default="")
+    ZCF_APOLLO_JOB_TITLE: str = ""
+    ZCF_APOLLO_SENIORITY: str = ""
+    ZCF_APOLLO_DEPARTMENT: str = ""
+    ZCF_APOLLO_LINKEDIN_URL: str = ""
+    ZCF_APOLLO_PHONE: str = ""
+    ZCF_APOLLO_COMPANY_SIZE: str = ""
+    ZCF_APOLLO_COMPANY_REVENUE: str = ""
+    ZCF_APOLLO_COMPANY_INDUSTRY: str = ""
+    ZCF_APOLLO_COMPANY_FOUNDED_YEAR: str = ""
+    ZCF_APOLLO_COMPANY_FUNDING_STAGE: str = ""
+    ZCF_APOLLO_COMPANY_FUNDING_TOTAL: str = ""
+    ZCF_APOLLO_TECH_STACK: str = ""
+
+    @classmethod
+    def from_env(cls, env_file: str = ".env") -> Settings:
+        """
+        Build Settings from the process environment, falling back to env_file.
+        Env var names are matched case-insensitively; real env vars win over the file.
+        """
+        env = _load_dotenv(env_file)
+        env.update((k.upper(), v) for k, v in os.environ.items())
+
+        # Only names that are actually set get coerced; everything else keeps its class default.
+        field_types = _field_types()
+        values: dict[str, Any] = {}
+        for name, raw in env.items():
+            type_name = field_types.get(name)
+            # Empty bool/int values fall back to the default rather than failing to parse.
+            if type_name is None or (type_name != "str" and not raw.strip()):
+                continue
+            values[name] = _coerce(name, type_name, raw)
+        return cls(**values)
 
     def validate_configuration(self) -> list[str]:
         """
@@ -162,41 +236,18 @@ class Settings(BaseSettings):
         if not self.REDIS_URL:
             errors.append("REDIS_URL is required")
 
-        # Critical: LLM (if not in DRY_RUN, we need Gemini)
-        if not self.DRY_RUN and not self.GEMINI_API_KEY:
-            errors.append("GEMINI_API_KEY is required when DRY_RUN=false")
-
-        # Critical: Zoho (if not in DRY_RUN)
+        # Critical: LLM + Zoho (if not in DRY_RUN)
         if not self.DRY_RUN:
-            if not self.ZOHO_CLIENT_ID:
-                errors.append("ZOHO_CLIENT_ID is required when DRY_RUN=false")
-            if not self.ZOHO_CLIENT_SECRET:
-                errors.append("ZOHO_CLIENT_SECRET is required when DRY_RUN=false")
-            if not self.ZOHO_REFRESH_TOKEN:
-                errors.append("ZOHO_REFRESH_TOKEN is required when DRY_RUN=false")
-            if self.ZOHO_DC not in ["us", "au", "eu", "in"]:
-                errors.append(f"ZOHO_DC must be one of: us, au, eu, in (got: {self.ZOHO_DC})")
-
-        # Warning: Webhook authentication
-        if not self.CALENDLY_SIGNING_KEY:
-            warnings.append("CALENDLY_SIGNING_KEY not set - Calendly webhooks will not be authenticated")
-        if not self.READAI_SHARED_SECRET:
-            warnings.append("READAI_SHARED_SECRET not set - Read.ai webhooks will not be authenticated")
-
-        # Warning: Slack alerts
-        if not self.SLACK_WEBHOOK_URL:
-            warnings.append("SLACK_WEBHOOK_URL not set - failure alerts will not be sent")
+            errors.extend(f"{name} is required when DRY_RUN=false" for name in _REQUIRED_WHEN_LIVE if not getattr(self, name))
+            if self.ZOHO_DC not in _ZOHO_DCS:
+                errors.append(f"ZOHO_DC must be one of: {', '.join(_ZOHO_DCS)} (got: {self.ZOHO_DC})")
+
+        # Warning: webhook authentication and Slack alerts
+        warnings.extend(f"{name} not set - {effect}" for name, effect in _UNSET_WARNINGS if not getattr(self, name))
 
         # Warning: Zoho custom fields (only check a few critical ones)
         if not self.DRY_RUN:
-            zcf_fields_missing = []
-            if not self.ZCF_DEMO_DATETIME:
-                zcf_fields_missing.append("ZCF_DEMO_DATETIME")
-            if not self.ZCF_LEAD_INTEL:
-                zcf_fields_missing.append("ZCF_LEAD_INTEL")
-            if not self.ZCF_MEDDIC_METRICS:
-                zcf_fields_missing.append("ZCF_MEDDIC_METRICS")
-
+            zcf_fields_missing = [name for name in _CRITICAL_ZCF_FIELDS if not getattr(self, name)]
             if zcf_fields_missing:
                 warnings.append(
                     f"Critical Zoho custom fields not configured: {', '.join(zcf_fields_missing)}. "
@@ -237,13 +288,14 @@ class Settings(BaseSettings):
         logger.info("Configuration validation passed")
 
 
-_settings: Settings | None = None
+@cache
+def _field_types() -> dict[str, str]:
+    return {f.name: f.type for f in fields(Settings)}
 
 
+@cache
 def get_settings() -> Settings:
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
+    """Process-wide Settings singleton; tests can reset it with get_settings.cache_clear()."""
+    return Settings.from_env()
 
 
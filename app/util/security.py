@@ -3,16 +3,21 @@ from __future__ import annotations
 import hmac
 import hashlib
 import time
-from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import NamedTuple, Optional
 
 
-@dataclass(frozen=True)
-class SignatureCheck:
+class SignatureCheck(NamedTuple):
     ok: bool
     reason: str = ""
 
 
+@lru_cache(maxsize=4)
+def _key_bytes(key: str) -> bytes:
+    # Signing keys come from settings and are effectively static per process.
+    return key.encode("utf-8")
+
+
 def verify_calendly_signature(
     *,
     signing_key: str,
@@ -34,23 +39,33 @@ def verify_calendly_signature(
     if not header_value:
         return SignatureCheck(ok=False, reason="missing_signature_header")
 
-    parts = {}
+    # Pick out t= and v1= directly; other fields (e.g. future v2=) are ignored.
+    ts_raw = "0"
+    sig = ""
+    for part in header_value.split(","):
+        part = part.strip()
+        if part.startswith("t="):
+            ts_raw = part[2:]
+        elif part.startswith("v1="):
+            sig = part[3:]
     try:
-        for kv in header_value.split(","):
-            k, v = kv.strip().split("=", 1)
-            parts[k] = v
-        ts = int(parts.get("t", "0"))
-        sig = parts.get("v1", "")
-    except Exception:  # noqa: BLE001
+        ts = int(ts_raw)
+    except ValueError:
         return SignatureCheck(ok=False, reason="invalid_signature_header_format")
 
     now = int(time.time())
     if ts <= 0 or abs(now - ts) > tolerance_seconds:
         return SignatureCheck(ok=False, reason="timestamp_out_of_tolerance")
 
-    signed_payload = f"{ts}.".encode("utf-8") + raw_body
-    digest = hmac.new(signing_key.encode("utf-8"), signed_payload, hashlib.sha256).hexdigest()
-    if not hmac.compare_digest(digest, sig):
+    # Feed '{t}.' and the body separately so the body is not copied into a new buffer.
+    mac = hmac.new(_key_bytes(signing_key), f"{ts}.".encode("utf-8"), hashlib.sha256)
+    mac.update(raw_body)
+    try:
+        provided = bytes.fromhex(sig)
+    except ValueError:
+        return SignatureCheck(ok=False, reason="invalid_signature_header_format")
+    # Compare raw digests: half the bytes of the hex form and no hexdigest() string.
+    if not hmac.compare_digest(mac.digest(), provided):
         return SignatureCheck(ok=False, reason="signature_mismatch")
     return SignatureCheck(ok=True)
 
@@ -6,8 +6,27 @@ Zoho Notes don't support Markdown, so we convert Markdown to plain text.
 
 from __future__ import annotations
 
+import io
+import re
+from functools import lru_cache
 from typing import Any
 
+# **Label:** value -> Label: value
+_BOLD_LABEL_RE = re.compile(r"\*\*([^*]+):\*\*")
+# **text** (not followed by :) -> TEXT for short labels, text otherwise
+_BOLD_RE = re.compile(r"\*\*([^*]+)\*\*")
+
+
+@lru_cache(maxsize=256)
+def _bar(ch: str, n: int) -> str:
+    # Header underlines repeat the same few lengths across notes.
+    return ch * n
+
+
+def _bold_repl(m: re.Match[str]) -> str:
+    text = m.group(1)
+    return text.upper() if len(text) < 30 else text
+
 
 def numbered_bullets(items: list[str]) -> str:
     cleaned = [i.strip() for i in items if i and i.strip()]
@@ -22,21 +41,18 @@ def qa_to_text(qa: Any) -> str:
     """
     if not isinstance(qa, list):
         return ""
+    # Number and render in one pass (same output as numbered_bullets over "q: a" lines).
     lines: list[str] = []
     for item in qa:
         if not isinstance(item, dict):
             continue
         q = str(item.get("question") or "").strip()
         a = str(item.get("answer") or "").strip()
-        if not q and not a:
-            continue
         if q and a:
-            lines.append(f"{q}: {a}")
-        elif q:
-            lines.append(q)
-        else:
-            lines.append(a)
-    return numbered_bullets(lines)
+            lines.append(f"{len(lines) + 1}. {q}: {a}")
+        elif q or a:
+            lines.append(f"{len(lines) + 1}. {q or a}")
+    return "\n".join(lines)
 
 
 def extract_domain_from_email(email: str) -> str:
@@ -44,9 +60,10 @@ def extract_domain_from_email(email: str) -> str:
     Extract domain from email address.
     Example: "john@acme.com" -> "acme.com"
     """
-    if not email or "@" not in email:
+    if not email:
         return ""
-    return email.split("@")[1].strip().lower()
+    _, sep, domain = email.partition("@")
+    return domain.strip().lower() if sep else ""
 
 
 def markdown_to_plain_text(markdown_text: str) -> str:
@@ -65,53 +82,45 @@ def markdown_to_plain_text(markdown_text: str) -> str:
     Returns:
         Plain text formatted for readability
     """
-    lines = markdown_text.split("\n")
-    result = []
-    
-    for line in lines:
+    result: list[str] = []
+    # Consecutive empty lines are collapsed as we go, so there is no second cleanup pass.
+    prev_empty = False
+
+    for line in markdown_text.split("\n"):
         # Headers: ## Header -> HEADER
-        if line.startswith("## "):
-            header = line[3:].strip()
-            result.append("")
-            result.append(header.upper())
-            result.append("=" * len(header))
-        elif line.startswith("### "):
-            header = line[4:].strip()
-            result.append("")
-            result.append(header.upper())
-            result.append("-" * len(header))
+        if line.startswith("## ") or line.startswith("### "):
+            h2 = line.startswith("## ")
+            header = line[3:].strip() if h2 else line[4:].strip()
+            if not prev_empty:
+                result.append("")
+            if header:
+                result.append(header.upper())
+                result.append(_bar("=" if h2 else "-", len(header)))
+                prev_empty = False
+            else:
+                prev_empty = True
+            continue
+
+        stripped = line.strip()
         # Bold: **text** -> TEXT: or just text (depending on context)
-        elif "**" in line:
+        if "**" in line:
             # Replace **text** with TEXT (for labels) or just text (for values)
-            import re
-            # Pattern: **Label:** value -> LABEL: value
-            line = re.sub(r'\*\*([^*]+):\*\*', r'\1:', line)
-            # Pattern: **text** (not followed by :) -> text (uppercase if it's a label)
-            line = re.sub(r'\*\*([^*]+)\*\*', lambda m: m.group(1).upper() if len(m.group(1)) < 30 else m.group(1), line)
-            result.append(line)
+            line = _BOLD_LABEL_RE.sub(r"\1:", line)
+            line = _BOLD_RE.sub(_bold_repl, line)
+            stripped = line.strip()
         # Bullet points: - item -> • item
-        elif line.strip().startswith("- "):
-            result.append("  • " + line.strip()[2:])
-        # Empty lines
-        elif not line.strip():
-            result.append("")
-        # Regular text
-        else:
+        elif stripped.startswith("- "):
+            line = "  • " + stripped[2:]
+
+        if stripped:
             result.append(line)
-    
-    # Clean up multiple consecutive empty lines
-    cleaned = []
-    prev_empty = False
-    for line in result:
-        if not line.strip():
-            if not prev_empty:
-                cleaned.append("")
-            prev_empty = True
-        else:
-            cleaned.append(line)
             prev_empty = False
-    
-    return "\n".join(cleaned).strip()
+        elif not prev_empty:
+            # Empty lines
+            result.append("")
+            prev_empty = True
+
+    return "\n".join(result).strip()
 
 
 def format_zoho_note_plain_text(
@@ -130,13 +139,13 @@ def format_zoho_note_plain_text(
     Returns:
         Plain text formatted note
     """
-    parts = []
-    
+    # Write lines straight into one buffer instead of collecting a list of parts.
+    buf = io.StringIO()
+    write = buf.write
+
     if title:
-        parts.append(title.upper())
-        parts.append("=" * len(title))
-        parts.append("")
-    
+        write(f"{title.upper()}\n{'=' * len(title)}\n\n")
+
     if sections:
         for section in sections:
             section_title = section.get("title", "")
@@ -144,13 +153,10 @@ def format_zoho_note_plain_text(
             items = section.get("items", [])
             
             if section_title:
-                parts.append(section_title.upper())
-                parts.append("-" * len(section_title))
-                parts.append("")
+                write(f"{section_title.upper()}\n{'-' * len(section_title)}\n\n")
             
             if content:
-                parts.append(content)
-                parts.append("")
+                write(f"{content}\n\n")
             
             if items:
                 for item in items:
@@ -159,21 +165,20 @@ def format_zoho_note_plain_text(
                         label = item.get("label", "")
                         value = item.get("value", "")
                         if label and value:
-                            parts.append(f"{label.upper()}: {value}")
+                            write(f"{label.upper()}: {value}\n")
                         elif label:
                             # Just a label (section header within section)
-                            parts.append(f"{label.upper()}:")
+                            write(f"{label.upper()}:\n")
                         elif value:
                             # Just a value (for bullet points)
-                            parts.append(f"  • {value}")
+                            write(f"  • {value}\n")
                     else:
                         # String item
-                        parts.append(f"  • {item}")
-                parts.append("")
+                        write(f"  • {item}\n")
+                write("\n")
     
     if footer:
-        parts.append("")
-        parts.append(footer)
+        write(f"\n{footer}\n")
     
-    return "\n".join(parts).strip()
+    return buf.getvalue().strip()
 
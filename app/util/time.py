@@ -2,17 +2,10 @@ from __future__ import annotations
 
 from datetime import date, timedelta
 
+# Days to add to reach the next business day, indexed by date.weekday() (Mon=0 .. Sun=6).
+_NEXT_BIZ_OFFSET = (1, 1, 1, 1, 3, 2, 1)
+
 
 def next_business_day(d: date | None = None) -> date:
     d = d or date.today()
-    nd = d + timedelta(days=1)
-    while nd.weekday() >= 5:  # 5=Sat, 6=Sun
-        nd += timedelta(days=1)
-    return nd
-
-
-
-
-
-
-
+    return d + timedelta(days=_NEXT_BIZ_OFFSET[d.weekday()])
@@ -12,6 +12,8 @@ logger = logging.getLogger(__name__)
 
 
 def main() -> None:
+    # Build Settings before Worker forks its work-horses: get_settings() builds and caches
+    # the frozen Settings dataclass here, and the children inherit it instead of re-reading .env.
     settings = get_settings()
     configure_logging(settings.LOG_LEVEL)
 
@@ -0,0 +1,272 @@
+"""Helpers shared by the standalone scripts (run as `python scripts/<name>.py`)"""
+import hashlib
+import hmac
+import json
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+
+import httpx
+
+try:  # optional: orjson is several times faster and produces bytes directly
+    import orjson
+except ImportError:
+    orjson = None
+
+ENV_FILE = Path(__file__).parent.parent / ".env"
+
+
+@lru_cache(maxsize=4)
+def _load_env_file(path: Path) -> dict[str, str]:
+    """Parse an env file once per process in a single pass (first occurrence of a key wins)"""
+    if not path.exists():
+        return {}
+    env: dict[str, str] = {}
+    for line in path.read_text().split("\n"):
+        key, sep, value = line.partition("=")
+        value = value.strip()
+        # Only plain KEY=value lines; comments, blanks and "export KEY=..." never match
+        if not sep or not value or not key.replace("_", "").isalnum():
+            continue
+        # Matching surrounding quotes are dropped, as app.settings does
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        env.setdefault(key, value)
+    return env
+
+
+def load_env_var(key: str, default: str = "", env_file_name: str = ".env") -> str:
+    """
+    Real env vars win over the repo's .env (as in app.settings); a named file such as
+    .env.production is read on its own so the shell can't shadow its values.
+    """
+    if env_file_name == ".env" and key in os.environ:
+        return os.environ[key]
+    return _load_env_file(ENV_FILE.parent / env_file_name).get(key, default)
+
+
+def json_dumps(obj) -> bytes:
+    """Compact JSON bytes (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(data: bytes | str):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=None)
+def get_http_client(base_url: str = "") -> httpx.Client:
+    """Process-wide HTTP/2 keep-alive client (one per base_url); left open until exit"""
+    return httpx.Client(
+        base_url=base_url.rstrip("/"),
+        http2=True,
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+    )
+
+
+# ZOHO_DC value -> domain suffix used by accounts.zoho.* / www.zohoapis.*
+ZOHO_DC_MAP = {"us": "com", "au": "com.au", "com": "com", "eu": "eu", "in": "in"}
+
+
+def zoho_dc_domain() -> str:
+    dc = load_env_var("ZOHO_DC", "au").lower()
+    # Map DC to correct Zoho domain (unknown DCs use the US data center, zoho.com)
+    return ZOHO_DC_MAP.get(dc, "com")
+
+
+def zoho_auth_headers(access_token: str) -> dict[str, str]:
+    return {
+        "Authorization": f"Zoho-oauthtoken {access_token}",
+        "Content-Type": "application/json",
+    }
+
+
+@lru_cache(maxsize=4)
+def _calendly_hmac(signing_key: str) -> hmac.HMAC:
+    """Keyed HMAC-SHA256 state; copying it skips re-deriving the key pads on every signature"""
+    return hmac.new(signing_key.encode("utf-8"), digestmod=hashlib.sha256)
+
+
+def calendly_signature_header(signing_key: str, body: bytes) -> str:
+    """Calendly-Webhook-Signature value (t=<unix ts>,v1=<hex>) for body, timestamped now"""
+    timestamp = int(time.time())
+    mac = _calendly_hmac(signing_key).copy()
+    mac.update(f"{timestamp}.".encode("utf-8"))
+    mac.update(body)
+    return f"t={timestamp},v1={mac.hexdigest()}"
+
+
+ZOHO_TOKEN_CACHE_FILE = ENV_FILE.parent / ".zoho_token_cache.json"
+
+
+def load_cached_zoho_token(dc: str, client_id: str, path: Path = ZOHO_TOKEN_CACHE_FILE) -> tuple[str, float] | None:
+    """Return (access_token, expires_at) if the on-disk cache matches this DC/client."""
+    try:
+        cached = json.loads(path.read_text())
+        if cached.get("dc") != dc or cached.get("client_id") != client_id:
+            return None
+        return cached["access_token"], float(cached["expires_at"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def save_cached_zoho_token(
+    dc: str, client_id: str, token: str, expires_at: float, path: Path = ZOHO_TOKEN_CACHE_FILE
+) -> None:
+    """Best-effort write of the access token, readable only by the current user."""
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"dc": dc, "client_id": client_id, "access_token": token, "expires_at": expires_at}, f)
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=4)
+def get_zoho_access_token(dc_domain: str) -> str:
+    """
+    Get Zoho access token using refresh token (once per process and DC).
+    Tokens live about an hour, so one cached on disk by an earlier run is reused until ~60s before expiry.
+    """
+    refresh_token = load_env_var("ZOHO_REFRESH_TOKEN", "")
+    client_id = load_env_var("ZOHO_CLIENT_ID", "")
+    client_secret = load_env_var("ZOHO_CLIENT_SECRET", "")
+
+    if not all([client_id, client_secret, refresh_token]):
+        raise ValueError("Missing Zoho credentials in .env (ZOHO_CLIENT_ID, ZOHO_CLIENT_SECRET, ZOHO_REFRESH_TOKEN)")
+
+    cached = load_cached_zoho_token(dc_domain, client_id)
+    if cached and time.time() < cached[1] - 60:
+        return cached[0]
+
+    token_url = f"https://accounts.zoho.{dc_domain}/oauth/v2/token"
+    token_data = {
+        "refresh_token": refresh_token,
+        "client_id": client_id,
+        "client_secret": client_secret,
+        "grant_type": "refresh_token",
+    }
+
+    resp = get_http_client().post(token_url, data=token_data, timeout=10.0)
+    resp.raise_for_status()
+    body = resp.json()
+    access_token = body["access_token"]
+    expires_at = time.time() + float(body.get("expires_in") or 3600)
+    save_cached_zoho_token(dc_domain, client_id, access_token, expires_at)
+    return access_token
+
+
+@lru_cache(maxsize=4)
+def get_zoho_client(dc_domain: str) -> httpx.Client:
+    """Authenticated, pooled zohoapis client for a DC (fetches the access token on first use)"""
+    return httpx.Client(
+        base_url=f"https://www.zohoapis.{dc_domain}",
+        headers=zoho_auth_headers(get_zoho_access_token(dc_domain)),
+        http2=True,
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+    )
+
+
+def calendly_payload_bytes(email: str, name: str, event_time: datetime) -> bytes:
+    """invitee.created body, serialized once so a retry re-signs identical bytes"""
+    invitee_uuid = str(uuid.uuid4())
+    event_uuid = str(uuid.uuid4())
+
+    payload = {
+        "event": "invitee.created",
+        "time": event_time.isoformat(),
+        "payload": {
+            "invitee": {
+                "uuid": invitee_uuid,
+                "name": name,
+                "email": email,
+                "uri": f"https://api.calendly.com/scheduled_events/{event_uuid}/invitees/{invitee_uuid}",
+            },
+            "event": {
+                "uuid": event_uuid,
+                "uri": f"https://api.calendly.com/scheduled_events/{event_uuid}",
+                "start_time": event_time.isoformat(),
+                "end_time": (event_time + timedelta(minutes=30)).isoformat(),
+                "timezone": "America/New_York",
+            },
+            "event_type": {
+                "uri": load_env_var("CALENDLY_EVENT_TYPE_URI", "https://api.calendly.com/event_types/TEST123")
+            },
+            "questions_and_answers": [
+                {"question": "What's your role?", "answer": "Packaging Manager"},
+                {"question": "Company?", "answer": "Test Company Inc"},
+            ],
+        },
+    }
+
+    return json_dumps(payload)
+
+
+def send_calendly_webhook(
+    session: httpx.Client, email: str, name: str, event_time: datetime, attempts: int = 3
+) -> dict | None:
+    """Send Calendly webhook (transport errors and 5xx are retried with a fresh signature timestamp)"""
+    raw_body = calendly_payload_bytes(email, name, event_time)
+    calendly_key = load_env_var("CALENDLY_SIGNING_KEY", "")
+    for attempt in range(1, attempts + 1):
+        headers = {"Content-Type": "application/json"}
+        if calendly_key:
+            headers["Calendly-Webhook-Signature"] = calendly_signature_header(calendly_key, raw_body)
+
+        try:
+            response = session.post("/webhooks/calendly", content=raw_body, headers=headers, timeout=30)
+        except httpx.TransportError:
+            if attempt == attempts:
+                raise
+        else:
+            if response.status_code < 500 or attempt == attempts:
+                break
+        time.sleep(0.5 * attempt)
+
+    if response.status_code != 200:
+        print(f"   ❌ Calendly webhook failed: {response.status_code} - {response.text}")
+        return None
+    return response.json()
+
+
+_TERMINAL_STATUSES = frozenset({"processed", "completed", "failed", "ignored"})
+
+
+def wait_for_processing(session: httpx.Client, event_id: str, max_wait: int = 60) -> bool:
+    """
+    Poll /debug/events/{event_id} until it is terminal (backoff 0.25s doubling to 2s, or the
+    server's Retry-After); True unless it failed or timed out
+    """
+    delay = 0.25
+    deadline = time.monotonic() + max_wait
+    while True:
+        retry_after = 0.0
+        try:
+            response = session.get(f"/debug/events/{event_id}", timeout=5)
+            if response.status_code == 200:
+                event_data = response.json()
+                status = event_data.get("status", "unknown")
+                if status in _TERMINAL_STATUSES:
+                    if status == "failed" and event_data.get("last_error"):
+                        print(f"   ⚠️  Event failed: {str(event_data['last_error'])[:200]}")
+                    return status != "failed"
+            try:
+                retry_after = float(response.headers.get("Retry-After", 0))
+            except ValueError:
+                retry_after = 0.0
+        except Exception:
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(retry_after or delay, remaining))
+        delay = min(delay * 2, 2.0)
@@ -1,17 +1,10 @@
 #!/usr/bin/env python3
 """Delete a Calendly webhook subscription"""
 import sys
-from pathlib import Path
-import httpx
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
 
-
-def load_env_var(key: str, env_file_name: str = ".env") -> str:
-    env_file = Path(__file__).parent.parent / env_file_name
-    if env_file.exists():
-        for line in env_file.read_text().splitlines():
-            if line.startswith(f"{key}="):
-                return line.split("=", 1)[1].strip()
-    return ""
+from _common import load_env_var
 
 
 def delete_webhook(token: str, webhook_id: str) -> bool:
@@ -22,9 +15,10 @@ def delete_webhook(token: str, webhook_id: str) -> bool:
         "Content-Type": "application/json",
     }
 
-    with httpx.Client(timeout=30.0) as client:
-        resp = client.delete(url, headers=headers)
-        resp.raise_for_status()
+    # One-shot call: stdlib urllib is enough.
+    # urlopen raises HTTPError for 4xx/5xx responses.
+    req = Request(url, headers=headers, method="DELETE")
+    with urlopen(req, timeout=30.0):
         return True
 
 
@@ -44,7 +38,7 @@ def main():
         if sys.argv[2] in ("--env", "-e") and len(sys.argv) > 3:
             env_file = sys.argv[3]
 
-    token = load_env_var("CALENDLY_API_TOKEN", env_file)
+    token = load_env_var("CALENDLY_API_TOKEN", env_file_name=env_file)
     if not token:
         print(f"❌ CALENDLY_API_TOKEN not found in {env_file}")
         return 1
@@ -58,11 +52,11 @@ def main():
         print("   python scripts/calendly_setup_webhook.py")
         return 0
 
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 404:
+    except HTTPError as e:
+        if e.code == 404:
             print(f"❌ Webhook not found: {webhook_id}")
         else:
-            print(f"❌ Error {e.response.status_code}: {e.response.text}")
+            print(f"❌ Error {e.code}: {e.read().decode('utf-8', errors='replace')}")
         return 1
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -2,61 +2,51 @@
 """List all Calendly webhook subscriptions"""
 import json
 import sys
-from pathlib import Path
-import httpx
+from http.client import HTTPSConnection
+from urllib.parse import urlencode
 
+from _common import load_env_var
 
-def load_env_var(key: str, env_file_name: str = ".env") -> str:
-    env_file = Path(__file__).parent.parent / env_file_name
-    if env_file.exists():
-        for line in env_file.read_text().splitlines():
-            if line.startswith(f"{key}="):
-                return line.split("=", 1)[1].strip()
-    return ""
+API_HOST = "api.calendly.com"
 
 
-def get_organization_uri(token: str) -> str:
-    """Get the organization URI from user info"""
-    url = "https://api.calendly.com/users/me"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
+def _get_json(conn: HTTPSConnection, headers: dict, path: str, params: dict | None = None) -> dict:
+    """GET a Calendly API path over an already-open keep-alive connection."""
+    if params:
+        path = f"{path}?{urlencode(params)}"
+    conn.request("GET", path, headers=headers)
+    resp = conn.getresponse()
+    # Read the full body before the next request can reuse the connection.
+    body = resp.read()
+    if resp.status >= 400:
+        raise RuntimeError(f"HTTP {resp.status} for {path}: {body.decode('utf-8', errors='replace')}")
+    return json.loads(body)
 
-    with httpx.Client(timeout=30.0) as client:
-        resp = client.get(url, headers=headers)
-        resp.raise_for_status()
-        data = resp.json()
 
-        # Extract organization URI from various possible locations
-        resource = data.get("resource", {})
-        org_uri = (
-            resource.get("current_organization") or
-            resource.get("organization") or
-            data.get("organization", "")
-        )
-        return org_uri
+def get_organization_uri(conn: HTTPSConnection, headers: dict) -> str:
+    """Get the organization URI from user info"""
+    data = _get_json(conn, headers, "/users/me")
+
+    # Extract organization URI from various possible locations
+    resource = data.get("resource", {})
+    org_uri = (
+        resource.get("current_organization") or
+        resource.get("organization") or
+        data.get("organization", "")
+    )
+    return org_uri
 
 
-def list_webhooks(token: str, organization_uri: str) -> list:
+def list_webhooks(conn: HTTPSConnection, headers: dict, organization_uri: str) -> list:
     """List all webhook subscriptions for an organization"""
-    url = "https://api.calendly.com/webhook_subscriptions"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
     params = {
         "organization": organization_uri,
         "scope": "organization"
     }
+    data = _get_json(conn, headers, "/webhook_subscriptions", params)
 
-    with httpx.Client(timeout=30.0) as client:
-        resp = client.get(url, headers=headers, params=params)
-        resp.raise_for_status()
-        data = resp.json()
-
-        # Calendly wraps response in "collection"
-        return data.get("collection", [])
+    # Calendly wraps response in "collection"
+    return data.get("collection", [])
 
 
 def main():
@@ -68,21 +58,28 @@ def main():
         else:
             env_file = sys.argv[1]
 
-    token = load_env_var("CALENDLY_API_TOKEN", env_file)
+    token = load_env_var("CALENDLY_API_TOKEN", env_file_name=env_file)
     if not token:
         print(f"❌ CALENDLY_API_TOKEN not found in {env_file}")
         return 1
 
     print("📋 Listing Calendly webhook subscriptions...\n")
 
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+    }
+    # Both calls go to the same host, so share one TLS connection.
+    conn = HTTPSConnection(API_HOST, timeout=30.0)
+
     try:
         # Get organization URI first
-        org_uri = get_organization_uri(token)
+        org_uri = get_organization_uri(conn, headers)
         if not org_uri:
             print("❌ Could not determine organization URI")
             return 1
 
-        webhooks = list_webhooks(token, org_uri)
+        webhooks = list_webhooks(conn, headers, org_uri)
 
         if not webhooks:
             print("No webhook subscriptions found.")
@@ -111,6 +108,8 @@ def main():
     except Exception as e:
         print(f"❌ Error: {e}")
         return 1
+    finally:
+        conn.close()
 
 
 if __name__ == "__main__":
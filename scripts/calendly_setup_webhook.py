@@ -1,70 +1,76 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
+import base64
 import json
-import secrets
+import os
 import sys
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 import httpx
 
-
-API_BASE = "https://api.calendly.com"
+from _common import _load_env_file
 
 
-def _read_env(path: Path) -> dict[str, str]:
-    if not path.exists():
-        return {}
-    out: dict[str, str] = {}
-    for line in path.read_text().splitlines():
-        line = line.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        k, v = line.split("=", 1)
-        out[k.strip()] = v.strip()
-    return out
+API_BASE = "https://api.calendly.com"
 
 
 def _write_env_value(path: Path, key: str, value: str) -> None:
     text = path.read_text() if path.exists() else ""
+    prefix = f"{key}="
+    if not (text.startswith(prefix) or f"\n{prefix}" in text):
+        # New key: append just the delta instead of rewriting the whole file.
+        if not text or text == "\n" or text.endswith("\n\n"):
+            sep = ""
+        elif text.endswith("\n"):
+            sep = "\n"
+        else:
+            sep = "\n\n"
+        with path.open("a") as f:
+            f.write(f"{sep}{prefix}{value}\n")
+        return
+
     lines = text.splitlines()
-    found = False
     for i, line in enumerate(lines):
-        if line.startswith(f"{key}="):
-            lines[i] = f"{key}={value}"
-            found = True
+        if line.startswith(prefix):
+            lines[i] = prefix + value
             break
-    if not found:
-        if lines and lines[-1].strip() != "":
-            lines.append("")
-        lines.append(f"{key}={value}")
     path.write_text("\n".join(lines) + "\n")
 
 
+def _calendly_client(token: str) -> httpx.Client:
+    """
+    One keep-alive client for every Calendly call in a run, so the TLS session is reused.
+    Explicit headers: Calendly's edge/CDN may block some default user agents.
+    """
+    return httpx.Client(
+        timeout=30.0,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=30.0),
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "User-Agent": "govisually-integrations/1.0 (+https://govisually.com)",
+        },
+    )
+
+
 def _http_json(
+    client: httpx.Client,
     method: str,
     url: str,
-    token: str,
     payload: Optional[dict[str, Any]] = None,
     params: Optional[dict[str, Any]] = None,
 ) -> dict[str, Any]:
-    """
-    Uses httpx with explicit headers. Calendly's edge/CDN may block some default user agents.
-    """
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-        "User-Agent": "govisually-integrations/1.0 (+https://govisually.com)",
-    }
     try:
-        with httpx.Client(timeout=30.0) as client:
-            resp = client.request(method, url, headers=headers, json=payload, params=params)
-            resp.raise_for_status()
-            if not resp.content:
-                return {}
-            return resp.json()
+        resp = client.request(method, url, json=payload, params=params)
+        resp.raise_for_status()
+        if not resp.content:
+            return {}
+        return resp.json()
     except httpx.HTTPStatusError as e:
         # Print body without leaking token.
         body = e.response.text[:2000]
@@ -74,38 +80,49 @@ def _http_json(
 def _deep_get(d: dict[str, Any], *paths: tuple[str, ...]) -> str:
     for path in paths:
         cur: Any = d
-        ok = True
-        for k in path:
-            if not isinstance(cur, dict) or k not in cur:
-                ok = False
-                break
-            cur = cur[k]
-        if ok and isinstance(cur, str) and cur:
+        try:
+            for k in path:
+                cur = cur[k]
+        except (KeyError, TypeError, IndexError):
+            continue
+        if isinstance(cur, str) and cur:
             return cur
     return ""
 
 
-def get_me(token: str) -> dict[str, Any]:
-    return _http_json("GET", f"{API_BASE}/users/me", token)
+def _preview(obj: Any, n: int = 2000) -> str:
+    """Compact JSON for diagnostics, truncated to n chars."""
+    s = json.dumps(obj, separators=(",", ":"))
+    return s[:n] + ("…" if len(s) > n else "")
 
 
-def list_event_types(token: str, user_uri: str) -> list[dict[str, Any]]:
+def get_me(client: httpx.Client) -> dict[str, Any]:
+    return _http_json(client, "GET", f"{API_BASE}/users/me")
+
+
+def iter_event_types(client: httpx.Client, user_uri: str) -> Iterator[dict[str, Any]]:
+    """Yield event types page by page, following Calendly's pagination.next_page links."""
     # Calendly supports listing event types by user query param.
-    body = _http_json(
-        "GET",
-        f"{API_BASE}/event_types",
-        token,
-        params={"user": user_uri, "active": "true", "count": 100},
-    )
-    col = body.get("collection") or body.get("data") or []
-    if isinstance(col, list):
-        return [x for x in col if isinstance(x, dict)]
-    return []
+    url: str = f"{API_BASE}/event_types"
+    params: Optional[dict[str, Any]] = {"user": user_uri, "active": "true", "count": 100}
+    while url:
+        body = _http_json(client, "GET", url, params=params)
+        col = body.get("collection") or body.get("data") or []
+        if isinstance(col, list):
+            yield from (x for x in col if isinstance(x, dict))
+        # next_page already carries the query string (including the page token).
+        pagination = body.get("pagination")
+        url = (pagination.get("next_page") or "") if isinstance(pagination, dict) else ""
+        params = None
+
+
+def list_event_types(client: httpx.Client, user_uri: str) -> list[dict[str, Any]]:
+    return list(iter_event_types(client, user_uri))
 
 
 def create_webhook_subscription(
     *,
-    token: str,
+    client: httpx.Client,
     url: str,
     organization_uri: str,
     scope: str,
@@ -123,7 +140,19 @@ def create_webhook_subscription(
         payload["user"] = user_uri
     if signing_key:
         payload["signing_key"] = signing_key
-    return _http_json("POST", f"{API_BASE}/webhook_subscriptions", token, payload)
+    return _http_json(client, "POST", f"{API_BASE}/webhook_subscriptions", payload)
+
+
+def generate_signing_keys(n: int, nbytes: int = 32) -> list[str]:
+    """
+    n URL-safe signing keys (same format as secrets.token_urlsafe(nbytes)),
+    drawn from a single os.urandom call for bulk provisioning.
+    """
+    buf = os.urandom(nbytes * n)
+    return [
+        base64.urlsafe_b64encode(buf[i : i + nbytes]).rstrip(b"=").decode("ascii")
+        for i in range(0, nbytes * n, nbytes)
+    ]
 
 
 def prompt(msg: str, default: str = "") -> str:
@@ -133,17 +162,37 @@ def prompt(msg: str, default: str = "") -> str:
     return input(f"{msg}: ").strip()
 
 
+def _answer(value: Optional[str], msg: str, default: str, assume_yes: bool) -> str:
+    """Use the CLI flag if given, the default under --yes, otherwise ask interactively."""
+    if value is not None:
+        return value
+    if assume_yes:
+        return default
+    return prompt(msg, default=default)
+
+
+def _parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Create a Calendly webhook subscription for this service")
+    parser.add_argument("env_file", nargs="?", default=None, help="Environment file (default: .env)")
+    parser.add_argument("--env", "-e", dest="env_flag", default=None, help="Environment file (same as positional)")
+    parser.add_argument("--event-type-index", default=None, help="Index of the demo event type (blank to skip)")
+    parser.add_argument("--scope", choices=("organization", "user"), default=None, help="Webhook scope")
+    parser.add_argument(
+        "--signing-key",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Generate a signing key and set CALENDLY_SIGNING_KEY (default: yes)",
+    )
+    parser.add_argument("--yes", "-y", action="store_true", help="Non-interactive: accept defaults and write the env file")
+    return parser.parse_args(argv)
+
+
 def main() -> None:
-    # Parse command-line arguments for env file
-    env_file_name = ".env"
-    if len(sys.argv) > 1:
-        if sys.argv[1] in ("--env", "-e") and len(sys.argv) > 2:
-            env_file_name = sys.argv[2]
-        else:
-            env_file_name = sys.argv[1]
+    args = _parse_args()
+    env_file_name = args.env_flag or args.env_file or ".env"
 
     env_path = Path(env_file_name)
-    env = _read_env(env_path)
+    env = _load_env_file(env_path)
 
     token = env.get("CALENDLY_API_TOKEN", "").strip()
     if not token:
@@ -158,31 +207,45 @@ def main() -> None:
 
     webhook_url = base_url.rstrip("/") + "/webhooks/calendly"
 
+    with _calendly_client(token) as client:
+        _setup_webhook(client, env_path, env_file_name, webhook_url, args)
+
+
+def _setup_webhook(
+    client: httpx.Client,
+    env_path: Path,
+    env_file_name: str,
+    webhook_url: str,
+    args: argparse.Namespace,
+) -> None:
     print("\nFetching your Calendly user + org…")
-    me = get_me(token)
+    me = get_me(client)
     user_uri = _deep_get(me, ("resource", "uri"), ("uri",), ("resource", "user", "uri"))
     org_uri = _deep_get(me, ("resource", "current_organization"), ("resource", "organization"), ("organization",))
     if not user_uri or not org_uri:
         print("Could not auto-detect user/org URIs from /users/me response.")
-        print(json.dumps(me, indent=2)[:2000])
+        print(_preview(me))
         raise SystemExit(1)
 
     print(f"User URI: {user_uri}")
     print(f"Org URI:  {org_uri}")
 
-    print("\nListing your active Event Types…")
-    ets = list_event_types(token, user_uri)
-    if not ets:
-        print("No event types found. Are you using the right Calendly account/token?")
-    else:
-        for i, et in enumerate(ets):
-            name = et.get("name") or ""
-            uri = et.get("uri") or ""
-            print(f"{i:>2}) {name}  [{uri}]")
+    # Under --yes with no index the listing would go unused; skip that round trip.
+    ets: list[dict[str, Any]] = []
+    if not (args.yes and args.event_type_index is None):
+        print("\nListing your active Event Types…")
+        ets = list_event_types(client, user_uri)
+        if not ets:
+            print("No event types found. Are you using the right Calendly account/token?")
+        else:
+            for i, et in enumerate(ets):
+                name = et.get("name") or ""
+                uri = et.get("uri") or ""
+                print(f"{i:>2}) {name}  [{uri}]")
 
     print("\nQuestion 1: Which event type is your *Demo booking*?")
     print("This sets CALENDLY_EVENT_TYPE_URI so our service ignores other Calendly bookings.")
-    choice = prompt("Enter number (or leave blank to skip)", default="")
+    choice = _answer(args.event_type_index, "Enter number (or leave blank to skip)", "", args.yes)
     demo_event_type_uri = ""
     if choice:
         try:
@@ -194,18 +257,19 @@ def main() -> None:
     print("\nQuestion 2: Webhook scope?")
     print("- organization: receive events for everyone in your org (recommended if multiple reps use Calendly)")
     print("- user: receive only your events")
-    scope = prompt("Enter scope", default="organization").lower()
+    scope = _answer(args.scope, "Enter scope", "organization", args.yes).lower()
     if scope not in ("organization", "user"):
         raise SystemExit("Scope must be 'organization' or 'user'")
 
     print("\nQuestion 3: Enable signature verification?")
     print("Recommended: yes. We'll generate a signing key and set CALENDLY_SIGNING_KEY.")
-    sig_yes = prompt("Enable signing key? (y/n)", default="y").lower().startswith("y")
-    signing_key = secrets.token_urlsafe(32) if sig_yes else ""
+    sig_flag = None if args.signing_key is None else ("y" if args.signing_key else "n")
+    sig_yes = _answer(sig_flag, "Enable signing key? (y/n)", "y", args.yes).lower().startswith("y")
+    signing_key = generate_signing_keys(1)[0] if sig_yes else ""
 
     print("\nCreating webhook subscription…")
     resp = create_webhook_subscription(
-        token=token,
+        client=client,
         url=webhook_url,
         organization_uri=org_uri,
         scope=scope,
@@ -221,11 +285,12 @@ def main() -> None:
     if sub_uri:
         print(f"Subscription URI: {sub_uri}")
     else:
-        print(json.dumps(resp, indent=2)[:2000])
+        print(_preview(resp))
 
     # Offer to write env values
     print(f"\nUpdate your {env_file_name} now?")
-    if prompt(f"Write CALENDLY_EVENT_TYPE_URI + CALENDLY_SIGNING_KEY to {env_file_name}? (y/n)", default="y").lower().startswith("y"):
+    write_msg = f"Write CALENDLY_EVENT_TYPE_URI + CALENDLY_SIGNING_KEY to {env_file_name}? (y/n)"
+    if _answer(None, write_msg, "y", args.yes).lower().startswith("y"):
         if demo_event_type_uri:
             _write_env_value(env_path, "CALENDLY_EVENT_TYPE_URI", demo_event_type_uri)
             print("Wrote CALENDLY_EVENT_TYPE_URI.")
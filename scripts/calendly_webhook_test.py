@@ -1,36 +1,12 @@
 #!/usr/bin/env python3
 """Send a test Calendly webhook event to the local or production endpoint"""
-import hashlib
-import hmac
 import json
 import sys
-import time
 import uuid
 from datetime import datetime, timezone, timedelta
-from pathlib import Path
 import httpx
 
-
-def load_env_var(key: str, env_file_name: str = ".env") -> str:
-    """Load environment variable from specified .env file"""
-    env_file = Path(__file__).parent.parent / env_file_name
-    if env_file.exists():
-        for line in env_file.read_text().splitlines():
-            if line.startswith(f"{key}="):
-                return line.split("=", 1)[1].strip()
-    return ""
-
-
-def create_calendly_signature(payload_json: str, signing_key: str, timestamp: str) -> str:
-    """Create Calendly webhook signature using HMAC-SHA256"""
-    # Calendly signature format: timestamp.payload_json
-    signed_payload = f"{timestamp}.{payload_json}"
-    signature = hmac.new(
-        signing_key.encode('utf-8'),
-        signed_payload.encode('utf-8'),
-        hashlib.sha256
-    ).hexdigest()
-    return signature
+from _common import calendly_signature_header, json_dumps, load_env_var
 
 
 def main():
@@ -43,9 +19,9 @@ def main():
             env_file = sys.argv[1]
 
     # Load config from env
-    base_url = load_env_var("BASE_URL", env_file)
-    signing_key = load_env_var("CALENDLY_SIGNING_KEY", env_file)
-    event_type_uri = load_env_var("CALENDLY_EVENT_TYPE_URI", env_file)
+    base_url = load_env_var("BASE_URL", env_file_name=env_file)
+    signing_key = load_env_var("CALENDLY_SIGNING_KEY", env_file_name=env_file)
+    event_type_uri = load_env_var("CALENDLY_EVENT_TYPE_URI", env_file_name=env_file)
 
     if not base_url:
         print(f"❌ BASE_URL not found in {env_file}")
@@ -92,14 +68,12 @@ def main():
     }
 
     # Prepare headers
-    payload_json = json.dumps(payload)
+    payload_bytes = json_dumps(payload)
     headers = {"Content-Type": "application/json"}
 
     # Add Calendly signature if signing key is configured
     if signing_key:
-        timestamp = str(int(time.time()))
-        signature = create_calendly_signature(payload_json, signing_key, timestamp)
-        headers["Calendly-Webhook-Signature"] = f"t={timestamp},v1={signature}"
+        headers["Calendly-Webhook-Signature"] = calendly_signature_header(signing_key, payload_bytes)
 
     # Print payload summary
     print("📋 Payload summary:")
@@ -113,10 +87,10 @@ def main():
 
     try:
         print("🚀 Sending webhook...")
-        with httpx.Client(timeout=30.0) as client:
+        with httpx.Client(timeout=30.0, http2=True) as client:
             response = client.post(
                 webhook_url,
-                content=payload_json,
+                content=payload_bytes,
                 headers=headers
             )
 
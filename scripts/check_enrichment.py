@@ -1,26 +1,79 @@
 #!/usr/bin/env python3
 """Check enrichment job status by event ID or email"""
+import asyncio
 import json
 import sys
+from dataclasses import dataclass, field, fields
 from pathlib import Path
+from typing import Any
 import httpx
 
+try:  # optional: msgspec decodes straight into EnrichEvent in one C pass
+    import msgspec
+except ImportError:
+    msgspec = None
 
-def check_by_event_id(event_id: str, base_url: str = "http://localhost:8000") -> dict | None:
+
+@dataclass(frozen=True, slots=True)
+class EnrichEvent:
+    """Shape of GET /debug/events/{event_id}"""
+    id: str = ""
+    source: str = ""
+    event_type: str = ""
+    external_id: str = ""
+    idempotency_key: str = ""
+    received_at: str = ""
+    status: str = "unknown"
+    attempts: int = 0
+    last_error: str = ""
+    payload: dict[str, Any] = field(default_factory=dict)
+
+
+_EVENT_FIELDS = frozenset(f.name for f in fields(EnrichEvent))
+
+
+def _decode_event(content: bytes) -> EnrichEvent:
+    if msgspec is not None:
+        return msgspec.json.decode(content, type=EnrichEvent)
+    data = json.loads(content)
+    return EnrichEvent(**{k: v for k, v in data.items() if k in _EVENT_FIELDS})
+
+
+def check_by_event_id(event_id: str, base_url: str = "http://localhost:8000") -> EnrichEvent | None:
     """Check enrichment status via debug endpoint"""
     try:
         url = f"{base_url}/debug/events/{event_id}"
-        with httpx.Client(timeout=10.0) as client:
+        with httpx.Client(timeout=10.0, http2=True) as client:
             resp = client.get(url)
             if resp.status_code == 404:
                 return None
             resp.raise_for_status()
-            return resp.json()
+            return _decode_event(resp.content)
     except Exception as e:
         print(f"❌ Error checking event: {e}")
         return None
 
 
+async def _fetch_event(client: httpx.AsyncClient, event_id: str, base_url: str) -> EnrichEvent | None:
+    try:
+        resp = await client.get(f"{base_url}/debug/events/{event_id}")
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+        return _decode_event(resp.content)
+    except Exception as e:
+        print(f"❌ Error checking event {event_id}: {e}")
+        return None
+
+
+async def check_many_events(event_ids: list[str], base_url: str = "http://localhost:8000") -> dict[str, EnrichEvent | None]:
+    """Check several events concurrently over one pooled client"""
+    limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+    async with httpx.AsyncClient(timeout=10.0, http2=True, limits=limits) as client:
+        events = await asyncio.gather(*[_fetch_event(client, eid, base_url) for eid in event_ids])
+    return dict(zip(event_ids, events))
+
+
 def check_by_email(email: str, base_url: str = "http://localhost:8000") -> None:
     """Trigger enrichment and show status"""
     try:
@@ -31,7 +84,7 @@ def check_by_email(email: str, base_url: str = "http://localhost:8000") -> None:
         }
         payload = {"email": email}
 
-        with httpx.Client(timeout=10.0) as client:
+        with httpx.Client(timeout=10.0, http2=True) as client:
             resp = client.post(url, json=payload, headers=headers)
             resp.raise_for_status()
             result = resp.json()
@@ -46,37 +99,11 @@ def check_by_email(email: str, base_url: str = "http://localhost:8000") -> None:
         print(f"❌ Error triggering enrichment: {e}")
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage:")
-        print("  python scripts/check_enrichment.py <event_id>")
-        print("  python scripts/check_enrichment.py --email <email>")
-        print("\nExamples:")
-        print("  python scripts/check_enrichment.py d12bb51d-5510-4795-9b17-fd6cf9ca302f")
-        print("  python scripts/check_enrichment.py --email kiran@govisually.com")
-        return 1
-
-    if sys.argv[1] == "--email":
-        if len(sys.argv) < 3:
-            print("❌ Email required after --email flag")
-            return 1
-        email = sys.argv[2]
-        check_by_email(email)
-        return 0
-
-    event_id = sys.argv[1]
-
-    print(f"🔍 Checking enrichment status for event: {event_id}\n")
-
-    event = check_by_event_id(event_id)
-    if not event:
-        print(f"❌ Event not found")
-        return 1
-
+def print_event(event_id: str, event: EnrichEvent) -> None:
     # Display event status
-    status = event.get("status", "unknown")
-    attempts = event.get("attempts", 0)
-    last_error = event.get("last_error", "")
+    status = event.status
+    attempts = event.attempts
+    last_error = event.last_error
 
     status_emoji = {
         "received": "⏳",
@@ -87,18 +114,18 @@ def main():
     }.get(status, "❓")
 
     print(f"{status_emoji} Status: {status}")
-    print(f"   Event ID: {event.get('id', event_id)}")
-    print(f"   Source: {event.get('source', 'N/A')}")
-    print(f"   Event Type: {event.get('event_type', 'N/A')}")
+    print(f"   Event ID: {event.id or event_id}")
+    print(f"   Source: {event.source or 'N/A'}")
+    print(f"   Event Type: {event.event_type or 'N/A'}")
     print(f"   Attempts: {attempts}")
-    print(f"   Received: {event.get('received_at', 'N/A')}")
+    print(f"   Received: {event.received_at or 'N/A'}")
 
     if last_error:
         print(f"\n❌ Last Error:")
         print(f"   {last_error}")
 
     # Show payload preview
-    payload = event.get("payload", {})
+    payload = event.payload
     email = payload.get("email", "N/A")
     lead_id = payload.get("lead_id", "N/A")
 
@@ -130,7 +157,41 @@ def main():
         print(f"\n💡 Check if worker is running:")
         print(f"   docker compose ps worker")
 
-    return 0
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage:")
+        print("  python scripts/check_enrichment.py <event_id> [<event_id> ...]")
+        print("  python scripts/check_enrichment.py --email <email>")
+        print("\nExamples:")
+        print("  python scripts/check_enrichment.py d12bb51d-5510-4795-9b17-fd6cf9ca302f")
+        print("  python scripts/check_enrichment.py --email kiran@govisually.com")
+        return 1
+
+    if sys.argv[1] == "--email":
+        if len(sys.argv) < 3:
+            print("❌ Email required after --email flag")
+            return 1
+        email = sys.argv[2]
+        check_by_email(email)
+        return 0
+
+    event_ids = sys.argv[1:]
+    if len(event_ids) == 1:
+        events = {event_ids[0]: check_by_event_id(event_ids[0])}
+    else:
+        events = asyncio.run(check_many_events(event_ids))
+
+    exit_code = 0
+    for event_id, event in events.items():
+        print(f"🔍 Checking enrichment status for event: {event_id}\n")
+        if not event:
+            print(f"❌ Event not found")
+            exit_code = 1
+            continue
+        print_event(event_id, event)
+
+    return exit_code
 
 
 if __name__ == "__main__":
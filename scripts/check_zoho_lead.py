@@ -1,79 +1,85 @@
 #!/usr/bin/env python3
 """Check what's actually in a Zoho Lead and compare with what we sent"""
+import asyncio
 import json
-import os
-import re
 import sys
-from pathlib import Path
 import httpx
 
-def load_env_var(key: str, default: str = "") -> str:
-    env_file = Path(__file__).parent.parent / ".env"
-    if env_file.exists():
-        content = env_file.read_text()
-        match = re.search(rf"^{re.escape(key)}=(.+)$", content, flags=re.M)
-        if match:
-            return match.group(1).strip()
-    return default
+from _common import get_zoho_access_token, load_env_var, zoho_dc_domain
 
-def get_zoho_lead(email: str) -> dict | None:
-    """Fetch lead from Zoho by email"""
-    dc = load_env_var("ZOHO_DC", "au")
-    refresh_token = load_env_var("ZOHO_REFRESH_TOKEN", "")
-    client_id = load_env_var("ZOHO_CLIENT_ID", "")
-    client_secret = load_env_var("ZOHO_CLIENT_SECRET", "")
-    module = load_env_var("ZOHO_LEADS_MODULE", "Leads")
+try:  # optional: msgspec decodes the search response in C and skips the unused "info" block
+    import msgspec
+
+    class _LeadSearch(msgspec.Struct):
+        data: list[dict] | None = None
+
+    def _decode_search(content: bytes) -> list[dict]:
+        return msgspec.json.decode(content, type=_LeadSearch).data or []
+except ImportError:
+    def _decode_search(content: bytes) -> list[dict]:
+        return json.loads(content).get("data") or []
+
+
+async def _search_lead(client: httpx.AsyncClient, api_url: str, headers: dict, email: str) -> dict | None:
+    params = {"criteria": f"(Email:equals:{email})"}
+    search_resp = await client.get(api_url, params=params, headers=headers)
     
-    if not refresh_token:
-        print("❌ ZOHO_REFRESH_TOKEN not set")
+    if search_resp.status_code == 204:
         return None
     
-    # Get access token
-    token_url = f"https://accounts.zoho.{dc}/oauth/v2/token"
-    token_data = {
-        "refresh_token": refresh_token,
-        "client_id": client_id,
-        "client_secret": client_secret,
-        "grant_type": "refresh_token",
-    }
+    search_resp.raise_for_status()
+    leads = _decode_search(search_resp.content)
+    return leads[0] if leads else None
+
+
+async def get_zoho_leads_async(emails: list[str]) -> dict[str, dict | None]:
+    """Fetch leads from Zoho by email concurrently, over one pooled client (and a cached access token)"""
+    module = load_env_var("ZOHO_LEADS_MODULE", "Leads")
     
+    results: dict[str, dict | None] = {email: None for email in emails}
+    if not load_env_var("ZOHO_REFRESH_TOKEN", ""):
+        print("❌ ZOHO_REFRESH_TOKEN not set")
+        return results
+    
+    limits = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0)
     try:
-        with httpx.Client(timeout=10.0) as client:
-            token_resp = client.post(token_url, data=token_data)
-            token_resp.raise_for_status()
-            access_token = token_resp.json()["access_token"]
-            
-            # Search for lead
-            api_url = f"https://www.zohoapis.{dc}/crm/v2/{module}/search"
-            params = {"criteria": f"(Email:equals:{email})"}
+        # Shared with the other Zoho scripts: skips the token endpoint while the on-disk token is valid
+        dc_domain = zoho_dc_domain()
+        access_token = get_zoho_access_token(dc_domain)
+        
+        async with httpx.AsyncClient(timeout=10.0, http2=True, limits=limits) as client:
+            # Search for all leads at once over the shared pool
+            api_url = f"https://www.zohoapis.{dc_domain}/crm/v2/{module}/search"
             headers = {"Authorization": f"Zoho-oauthtoken {access_token}"}
-            
-            search_resp = client.get(api_url, params=params, headers=headers, timeout=10.0)
-            
-            if search_resp.status_code == 204:
-                return None
-            
-            search_resp.raise_for_status()
-            data = search_resp.json()
-            
-            if data.get("data") and len(data["data"]) > 0:
-                return data["data"][0]
-            
-            return None
+            found = await asyncio.gather(
+                *[_search_lead(client, api_url, headers, email) for email in emails], return_exceptions=True
+            )
+            for email, lead in zip(emails, found):
+                if isinstance(lead, Exception):
+                    print(f"❌ Error ({email}): {lead}")
+                else:
+                    results[email] = lead
     except Exception as e:
         print(f"❌ Error: {e}")
-        return None
+    return results
 
-def main():
-    email = sys.argv[1] if len(sys.argv) > 1 else "test.buyer@example.com"
-    
-    print(f"🔍 Fetching Zoho Lead for: {email}\n")
-    
-    lead = get_zoho_lead(email)
-    if not lead:
-        print(f"❌ Lead not found")
-        return 1
-    
+
+def get_zoho_leads(emails: list[str]) -> dict[str, dict | None]:
+    """Fetch leads from Zoho by email"""
+    return asyncio.run(get_zoho_leads_async(emails))
+
+
+def get_zoho_lead(email: str) -> dict | None:
+    """Fetch lead from Zoho by email"""
+    return get_zoho_leads([email])[email]
+
+
+# Fields shown in the "All Custom Fields" debug dump
+_DEBUG_FIELD_PREFIXES = ("MEDDIC_", "Competition", "Identified_", "Champion_")
+_DEBUG_FIELD_KEYS = frozenset({"Lead_Status", "Email", "Full_Name"})
+
+
+def print_lead(lead: dict) -> None:
     print(f"✅ Lead found: {lead.get('id')}")
     print(f"   Name: {lead.get('Full_Name', 'N/A')}")
     print(f"   Email: {lead.get('Email', 'N/A')}")
@@ -95,8 +101,9 @@ def main():
     for field_api, field_label in meddic_fields.items():
         value = lead.get(field_api, "")
         if value:
+            s = value if isinstance(value, str) else str(value)
             print(f"\n✅ {field_label} ({field_api}):")
-            print(f"   {str(value)[:200]}{'...' if len(str(value)) > 200 else ''}")
+            print(f"   {s[:200]}{'...' if len(s) > 200 else ''}")
         else:
             print(f"\n❌ {field_label} ({field_api}): (empty)")
     
@@ -105,11 +112,26 @@ def main():
     print("All Custom Fields (for debugging):")
     print("="*60)
     for key, value in sorted(lead.items()):
-        if key.startswith(("MEDDIC_", "Competition", "Identified_", "Champion_")) or key in ["Lead_Status", "Email", "Full_Name"]:
-            if value:
-                print(f"  {key}: {str(value)[:100]}{'...' if len(str(value)) > 100 else ''}")
+        if value and (key.startswith(_DEBUG_FIELD_PREFIXES) or key in _DEBUG_FIELD_KEYS):
+            s = value if isinstance(value, str) else str(value)
+            print(f"  {key}: {s[:100]}{'...' if len(s) > 100 else ''}")
+
+
+def main():
+    emails = sys.argv[1:] or ["test.buyer@example.com"]
+    leads = get_zoho_leads(emails)
+    
+    exit_code = 0
+    for email in emails:
+        print(f"🔍 Fetching Zoho Lead for: {email}\n")
+        lead = leads[email]
+        if not lead:
+            print(f"❌ Lead not found")
+            exit_code = 1
+            continue
+        print_lead(lead)
     
-    return 0
+    return exit_code
 
 if __name__ == "__main__":
     sys.exit(main())
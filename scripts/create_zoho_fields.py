@@ -1,68 +1,72 @@
 #!/usr/bin/env python3
 """Create Apollo custom fields in Zoho CRM Leads module"""
-import json
-import re
+import asyncio
 import sys
-from pathlib import Path
 import httpx
 
+from _common import get_zoho_access_token, get_zoho_client, load_env_var, zoho_auth_headers, zoho_dc_domain
 
-def load_env_var(key: str, default: str = "") -> str:
-    env_file = Path(__file__).parent.parent / ".env"
-    if env_file.exists():
-        content = env_file.read_text()
-        match = re.search(rf"^{re.escape(key)}=(.+)$", content, flags=re.M)
-        if match:
-            return match.group(1).strip()
-    return default
-
-
-def get_zoho_access_token() -> str:
-    """Get Zoho access token using refresh token"""
-    dc = load_env_var("ZOHO_DC", "au")
-    refresh_token = load_env_var("ZOHO_REFRESH_TOKEN", "")
-    client_id = load_env_var("ZOHO_CLIENT_ID", "")
-    client_secret = load_env_var("ZOHO_CLIENT_SECRET", "")
-
-    if not refresh_token:
-        raise ValueError("ZOHO_REFRESH_TOKEN not set in .env")
-
-    # Map DC to correct Zoho domain
-    dc_domain = "com.au" if dc == "au" else dc
-    token_url = f"https://accounts.zoho.{dc_domain}/oauth/v2/token"
-    token_data = {
-        "refresh_token": refresh_token,
-        "client_id": client_id,
-        "client_secret": client_secret,
-        "grant_type": "refresh_token",
-    }
-
-    with httpx.Client(timeout=10.0) as client:
-        resp = client.post(token_url, data=token_data)
-        resp.raise_for_status()
-        return resp.json()["access_token"]
-
-
-def create_custom_field(access_token: str, module: str, field_config: dict) -> dict:
-    """Create a custom field in Zoho CRM"""
-    dc = load_env_var("ZOHO_DC", "au")
-    # Map DC to correct Zoho domain
-    dc_domain = "com.au" if dc == "au" else dc
-    url = f"https://www.zohoapis.{dc_domain}/crm/v2/settings/fields?module={module}"
-
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}",
-        "Content-Type": "application/json",
-    }
-
-    payload = {
-        "fields": [field_config]
-    }
 
-    with httpx.Client(timeout=30.0) as client:
-        resp = client.post(url, headers=headers, json=payload)
+def _field_entries(resp: httpx.Response, expected: int) -> list[dict]:
+    # Zoho reports per-field outcomes (including DUPLICATE_DATA) even on a 4xx
+    body = resp.json() if resp.content else {}
+    entries = body.get("fields") if isinstance(body, dict) else None
+    if not isinstance(entries, list) or len(entries) != expected:
         resp.raise_for_status()
-        return resp.json()
+        raise ValueError(f"Unexpected response: {body}")
+    return entries
+
+
+async def create_custom_field(
+    client: httpx.AsyncClient, sem: asyncio.Semaphore, module: str, field_config: dict
+) -> dict:
+    """Create a single custom field in Zoho CRM; returns its per-field entry"""
+    async with sem:
+        resp = await client.post("/crm/v2/settings/fields", params={"module": module}, json={"fields": [field_config]})
+    return _field_entries(resp, 1)[0]
+
+
+async def create_fields_concurrently(
+    access_token: str, dc_domain: str, module: str, field_configs: list[dict]
+) -> list[dict | BaseException]:
+    """Per-field fallback: one POST per field, overlapped on a single HTTP/2 connection"""
+    sem = asyncio.Semaphore(8)
+    async with httpx.AsyncClient(
+        base_url=f"https://www.zohoapis.{dc_domain}",
+        headers=zoho_auth_headers(access_token),
+        timeout=30.0,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=16, max_connections=16),
+    ) as client:
+        return await asyncio.gather(
+            *[create_custom_field(client, sem, module, cfg) for cfg in field_configs], return_exceptions=True
+        )
+
+
+# Zoho caps how many fields one settings/fields request may carry
+FIELDS_PER_REQUEST = 10
+
+
+def create_custom_fields(client: httpx.Client, module: str, field_configs: list[dict]) -> list[dict]:
+    """Create several custom fields in one request; returns per-field entries aligned with field_configs"""
+    resp = client.post("/crm/v2/settings/fields", params={"module": module}, json={"fields": field_configs})
+    return _field_entries(resp, len(field_configs))
+
+
+def _report_field_result(entry: dict) -> bool:
+    """Print the outcome for one field entry; True if the field is now available"""
+    status = entry.get("status") if isinstance(entry.get("status"), dict) else {}
+    if status.get("status_code") == "SUCCESS" or entry.get("code") == "SUCCESS":
+        print("✅")
+        return True
+    # Check if it's a duplicate (field already exists)
+    if entry.get("code") == "DUPLICATE_DATA":
+        print("⚠️  Already exists")
+        return True  # Count as success since field is available
+    error_msg = status.get("message") or entry.get("message") or "Unknown error"
+    print(f"⚠️  {error_msg}")
+    print(f"   Full result: {entry}")
+    return False
 
 
 def main():
@@ -70,7 +74,8 @@ def main():
 
     # Get access token
     try:
-        access_token = get_zoho_access_token()
+        dc_domain = zoho_dc_domain()
+        access_token = get_zoho_access_token(dc_domain)
         print("✅ Got Zoho access token\n")
     except Exception as e:
         print(f"❌ Failed to get Zoho access token: {e}")
@@ -153,42 +158,37 @@ def main():
     created_count = 0
     failed_count = 0
 
-    for field_config in fields_to_create:
-        field_name = field_config["api_name"]
+    client = get_zoho_client(dc_domain)
+    for i in range(0, len(fields_to_create), FIELDS_PER_REQUEST):
+        batch = fields_to_create[i : i + FIELDS_PER_REQUEST]
         try:
-            print(f"Creating field: {field_name}...", end=" ")
-            result = create_custom_field(access_token, module, field_config)
-
-            # Handle different response formats
-            if not isinstance(result, dict):
-                print(f"⚠️  Unexpected response type: {type(result)}")
-                print(f"   Full result: {result}")
-                failed_count += 1
-            elif result.get("fields") and result["fields"][0].get("status", {}).get("status_code") == "SUCCESS":
-                print("✅")
-                created_count += 1
-            else:
-                error_msg = result.get("fields", [{}])[0].get("status", {}).get("message", "Unknown error")
-                print(f"⚠️  {error_msg}")
-                print(f"   Full result: {result}")
-                failed_count += 1
-
-        except httpx.HTTPStatusError as e:
-            error_body = e.response.json() if e.response.content else {}
-
-            # Check if it's a duplicate (field already exists)
-            if error_body.get("fields", [{}])[0].get("code") == "DUPLICATE_DATA":
-                print("⚠️  Already exists")
-                created_count += 1  # Count as success since field is available
+            entries = create_custom_fields(client, module, batch)
+        except Exception as e:
+            if isinstance(e, httpx.HTTPStatusError) and e.response.content:
+                print(f"⚠️  Batch request rejected ({e.response.status_code}): {e.response.text[:500]}")
             else:
-                error_msg = error_body.get("message", str(e))
+                print(f"⚠️  Batch request failed: {e}")
+            print("   Falling back to one request per field...")
+            entries = asyncio.run(create_fields_concurrently(access_token, dc_domain, module, batch))
+
+        for field_config, entry in zip(batch, entries):
+            print(f"Creating field: {field_config['api_name']}...", end=" ")
+            if isinstance(entry, httpx.HTTPStatusError):
+                error_body = entry.response.json() if entry.response.content else {}
+                error_msg = error_body.get("message", str(entry)) if isinstance(error_body, dict) else str(entry)
                 print(f"❌ {error_msg}")
                 if error_body:
                     print(f"   Full response: {error_body}")
                 failed_count += 1
-        except Exception as e:
-            print(f"❌ {e}")
-            failed_count += 1
+            elif isinstance(entry, BaseException):
+                print(f"❌ {entry}")
+                failed_count += 1
+            elif isinstance(entry, dict) and _report_field_result(entry):
+                created_count += 1
+            else:
+                if not isinstance(entry, dict):
+                    print(f"⚠️  Unexpected response type: {type(entry)}")
+                failed_count += 1
 
     print(f"\n{'='*60}")
     print(f"✅ Created: {created_count} fields")
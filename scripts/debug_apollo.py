@@ -2,19 +2,8 @@
 """Debug Apollo API directly with raw requests"""
 import json
 import sys
-import httpx
-from pathlib import Path
-import re
 
-
-def load_env_var(key: str, default: str = "") -> str:
-    env_file = Path(__file__).parent.parent / ".env"
-    if env_file.exists():
-        content = env_file.read_text()
-        match = re.search(rf"^{re.escape(key)}=(.+)$", content, flags=re.M)
-        if match:
-            return match.group(1).strip()
-    return default
+from _common import get_http_client, load_env_var
 
 
 def test_person(email: str):
@@ -39,22 +28,21 @@ def test_person(email: str):
     print(f"   API Key: {api_key[:10]}...{api_key[-5:]}\n")
 
     try:
-        with httpx.Client(timeout=30.0) as client:
-            resp = client.post(url, headers=headers, json=payload)
-
-            print(f"📥 Response Status: {resp.status_code}")
-            print(f"📥 Response Headers: {dict(resp.headers)}\n")
-
-            if resp.status_code == 200:
-                body = resp.json()
-                print(f"✅ Success!\n")
-                print(json.dumps(body, indent=2))
-                return 0
-            else:
-                print(f"❌ Failed!")
-                print(f"Response Body:")
-                print(resp.text)
-                return 1
+        resp = get_http_client().post(url, headers=headers, json=payload)
+
+        print(f"📥 Response Status: {resp.status_code}")
+        print(f"📥 Response Headers: {dict(resp.headers)}\n")
+
+        if resp.status_code == 200:
+            body = resp.json()
+            print(f"✅ Success!\n")
+            print(json.dumps(body, indent=2))
+            return 0
+        else:
+            print(f"❌ Failed!")
+            print(f"Response Body:")
+            print(resp.text)
+            return 1
 
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -86,22 +74,21 @@ def test_company(domain: str):
     print(f"   API Key: {api_key[:10]}...{api_key[-5:]}\n")
 
     try:
-        with httpx.Client(timeout=30.0) as client:
-            resp = client.get(url, headers=headers, params=params)
-
-            print(f"📥 Response Status: {resp.status_code}")
-            print(f"📥 Response Headers: {dict(resp.headers)}\n")
-
-            if resp.status_code == 200:
-                body = resp.json()
-                print(f"✅ Success!\n")
-                print(json.dumps(body, indent=2))
-                return 0
-            else:
-                print(f"❌ Failed!")
-                print(f"Response Body:")
-                print(resp.text)
-                return 1
+        resp = get_http_client().get(url, headers=headers, params=params)
+
+        print(f"📥 Response Status: {resp.status_code}")
+        print(f"📥 Response Headers: {dict(resp.headers)}\n")
+
+        if resp.status_code == 200:
+            body = resp.json()
+            print(f"✅ Success!\n")
+            print(json.dumps(body, indent=2))
+            return 0
+        else:
+            print(f"❌ Failed!")
+            print(f"Response Body:")
+            print(resp.text)
+            return 1
 
     except Exception as e:
         print(f"❌ Error: {e}")
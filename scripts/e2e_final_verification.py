@@ -5,25 +5,16 @@ Shows exactly what's being sent to Zoho and verifies the complete flow.
 """
 import json
 import os
-import re
 import sys
 import time
 import uuid
 import hmac
 import hashlib
 import subprocess
-from pathlib import Path
 from datetime import datetime, timezone, timedelta
 import requests
 
-def load_env_var(key: str, default: str = "") -> str:
-    env_file = Path(__file__).parent.parent / ".env"
-    if env_file.exists():
-        content = env_file.read_text()
-        match = re.search(rf"^{re.escape(key)}=(.+)$", content, flags=re.M)
-        if match:
-            return match.group(1).strip()
-    return default
+from _common import load_env_var
 
 def get_worker_logs_for_event(event_id: str) -> str:
     """Get all worker logs for an event"""
@@ -8,29 +8,23 @@ Simulates the complete customer journey:
 3. Demo happens (Read.ai meeting_end)
 4. System extracts MEDDIC and updates Lead in Zoho
 """
-import json
-import os
 import re
+import subprocess
 import sys
 import time
 import uuid
-import hmac
-import hashlib
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-import requests
+import httpx
 
-def load_env_var(key: str, default: str = "") -> str:
-    """Load environment variable from .env file or environment"""
-    if key in os.environ:
-        return os.environ[key]
-    env_file = Path(__file__).parent.parent / ".env"
-    if env_file.exists():
-        content = env_file.read_text()
-        match = re.search(rf"^{re.escape(key)}=(.+)$", content, flags=re.M)
-        if match:
-            return match.group(1).strip()
-    return default
+from _common import (
+    get_http_client,
+    json_dumps,
+    json_loads,
+    load_env_var,
+    send_calendly_webhook,
+    wait_for_processing,
+)
 
 def print_section(title: str):
     """Print a formatted section header"""
@@ -44,152 +38,38 @@ def print_step(step_num: int, title: str):
     print(f"STEP {step_num}: {title}")
     print(f"{'─'*70}")
 
-def send_calendly_webhook(base_url: str, email: str, name: str, event_time: datetime) -> dict:
-    """Send a Calendly invitee.created webhook"""
-    webhook_url = f"{base_url.rstrip('/')}/webhooks/calendly"
-    
-    # Generate unique Calendly URIs
-    invitee_uuid = str(uuid.uuid4())
-    event_uuid = str(uuid.uuid4())
-    
-    payload = {
-        "event": "invitee.created",
-        "time": event_time.isoformat(),
-        "payload": {
-            "invitee": {
-                "uuid": invitee_uuid,
-                "name": name,
-                "email": email,
-                "uri": f"https://api.calendly.com/scheduled_events/{event_uuid}/invitees/{invitee_uuid}",
-                "text_reminder_number": None,
-                "timezone": "America/New_York",
-                "event_guests": [],
-                "event_guest_statuses": [],
-                "created_at": (event_time - timedelta(days=1)).isoformat(),
-                "updated_at": (event_time - timedelta(days=1)).isoformat(),
-                "canceled": False,
-                "cancellation": None,
-                "payment": None,
-                "tracking": {
-                    "utm_campaign": None,
-                    "utm_source": None,
-                    "utm_medium": None,
-                    "utm_content": None,
-                    "utm_term": None,
-                    "salesforce_uuid": None
-                },
-                "rescheduled": False
-            },
-            "event": {
-                "uuid": event_uuid,
-                "uri": f"https://api.calendly.com/scheduled_events/{event_uuid}",
-                "start_time": event_time.isoformat(),
-                "end_time": (event_time + timedelta(minutes=30)).isoformat(),
-                "timezone": "America/New_York",
-                "created_at": (event_time - timedelta(days=1)).isoformat(),
-                "updated_at": (event_time - timedelta(days=1)).isoformat()
-            },
-            "event_type": {
-                "uuid": "event-type-uuid-123",
-                "kind": "One-on-One",
-                "slug": "demo",
-                "name": "GoVisually Demo",
-                "duration": 30,
-                "uri": "https://api.calendly.com/event_types/event-type-uuid-123"
-            },
-            "questions_and_answers": [
-                {
-                    "question": "What's your role?",
-                    "answer": "Packaging Manager"
-                },
-                {
-                    "question": "What's your company size?",
-                    "answer": "500-1000 employees"
-                }
-            ]
-        }
-    }
-    
-    headers = {"Content-Type": "application/json"}
-    calendly_key = load_env_var("CALENDLY_SIGNING_KEY", "")
-    if calendly_key:
-        # Generate proper Calendly signature: t=timestamp,v1=hexsignature
-        # Signature is HMAC-SHA256 of "{timestamp}.{raw_body}"
-        timestamp = int(time.time())
-        raw_body = json.dumps(payload).encode("utf-8")
-        signed_payload = f"{timestamp}.".encode("utf-8") + raw_body
-        signature = hmac.new(calendly_key.encode("utf-8"), signed_payload, hashlib.sha256).hexdigest()
-        headers["Calendly-Webhook-Signature"] = f"t={timestamp},v1={signature}"
-    
-    print(f"   📤 Sending to: {webhook_url}")
-    print(f"   👤 Attendee: {name} ({email})")
-    print(f"   📅 Event Time: {event_time.strftime('%Y-%m-%d %H:%M %Z')}")
-    
-    response = requests.post(webhook_url, json=payload, headers=headers, timeout=30)
-    
-    if response.status_code != 200:
-        print(f"   ❌ Failed: {response.status_code} - {response.text}")
-        return None
-    
-    result = response.json()
-    print(f"   ✅ Accepted: Event ID {result.get('event_id')}")
-    return result
+# Demo transcript with MEDDIC information: (start_min, end_min, speaker, words);
+# _CUSTOMER marks the attendee's lines and is replaced by their first name.
+_CUSTOMER = object()
+_DEMO_SCRIPT = (
+    (0, 2, "GV Rep", "Thanks for joining today! Let's start with understanding your current packaging workflow and what challenges you're facing."),
+    (2, 5, _CUSTOMER, "We're currently using Workfront but it's too slow. Our artwork approval process takes about 3 months and we need to get it down to 4 weeks. We also have issues with human error in compliance checks for FDA regulations."),
+    (5, 8, "GV Rep", "GoVisually can definitely help with that. We have AI-powered compliance checking and version control. What integrations are important for you?"),
+    (8, 10, _CUSTOMER, "Integration with Adobe is critical for us. We also need SSO and compliance features for FDA and nutrition facts. Our IT Director John needs to approve the budget, and we'll need to evaluate 3 vendors by Q2."),
+    (10, 12, "Sara", "I'm really excited about this! This could solve our biggest pain point. The AI compliance checking sounds perfect for reducing errors."),
+    (12, 15, _CUSTOMER, "Let's schedule a follow-up. We need to get pricing information this week, and I'd like to connect you with our packaging project manager Emond for technical questions."),
+    (15, 18, "GV Rep", "Perfect! I'll send pricing and we can schedule a technical deep-dive with Emond. Any concerns about implementation?"),
+    (18, 20, _CUSTOMER, "The main concern is making sure Emond is comfortable with the system. Also, we need to make sure it integrates well with our existing Adobe workflows."),
+)
 
-def send_readai_webhook(base_url: str, email: str, name: str, meeting_time: datetime) -> dict:
+def send_readai_webhook(session: httpx.Client, email: str, name: str, meeting_time: datetime) -> dict:
     """Send a Read.ai meeting_end webhook"""
-    webhook_url = f"{base_url.rstrip('/')}/webhooks/readai"
+    webhook_url = f"{session.base_url}/webhooks/readai"
     session_id = f"e2e-{uuid.uuid4().hex[:12]}"
     
     # Create a realistic demo transcript with MEDDIC information
+    base = int(meeting_time.timestamp())
+    parts = name.split()
+    first_name = parts[0] if parts else "Customer"
+    last_name = parts[-1] if len(parts) > 1 else ""
     transcript_blocks = [
         {
-            "start_time": int(meeting_time.timestamp()),
-            "end_time": int((meeting_time + timedelta(minutes=2)).timestamp()),
-            "speaker": {"name": "GV Rep"},
-            "words": "Thanks for joining today! Let's start with understanding your current packaging workflow and what challenges you're facing."
-        },
-        {
-            "start_time": int((meeting_time + timedelta(minutes=2)).timestamp()),
-            "end_time": int((meeting_time + timedelta(minutes=5)).timestamp()),
-            "speaker": {"name": name.split()[0] if name else "Customer"},
-            "words": "We're currently using Workfront but it's too slow. Our artwork approval process takes about 3 months and we need to get it down to 4 weeks. We also have issues with human error in compliance checks for FDA regulations."
-        },
-        {
-            "start_time": int((meeting_time + timedelta(minutes=5)).timestamp()),
-            "end_time": int((meeting_time + timedelta(minutes=8)).timestamp()),
-            "speaker": {"name": "GV Rep"},
-            "words": "GoVisually can definitely help with that. We have AI-powered compliance checking and version control. What integrations are important for you?"
-        },
-        {
-            "start_time": int((meeting_time + timedelta(minutes=8)).timestamp()),
-            "end_time": int((meeting_time + timedelta(minutes=10)).timestamp()),
-            "speaker": {"name": name.split()[0] if name else "Customer"},
-            "words": "Integration with Adobe is critical for us. We also need SSO and compliance features for FDA and nutrition facts. Our IT Director John needs to approve the budget, and we'll need to evaluate 3 vendors by Q2."
-        },
-        {
-            "start_time": int((meeting_time + timedelta(minutes=10)).timestamp()),
-            "end_time": int((meeting_time + timedelta(minutes=12)).timestamp()),
-            "speaker": {"name": "Sara"},
-            "words": "I'm really excited about this! This could solve our biggest pain point. The AI compliance checking sounds perfect for reducing errors."
-        },
-        {
-            "start_time": int((meeting_time + timedelta(minutes=12)).timestamp()),
-            "end_time": int((meeting_time + timedelta(minutes=15)).timestamp()),
-            "speaker": {"name": name.split()[0] if name else "Customer"},
-            "words": "Let's schedule a follow-up. We need to get pricing information this week, and I'd like to connect you with our packaging project manager Emond for technical questions."
-        },
-        {
-            "start_time": int((meeting_time + timedelta(minutes=15)).timestamp()),
-            "end_time": int((meeting_time + timedelta(minutes=18)).timestamp()),
-            "speaker": {"name": "GV Rep"},
-            "words": "Perfect! I'll send pricing and we can schedule a technical deep-dive with Emond. Any concerns about implementation?"
-        },
-        {
-            "start_time": int((meeting_time + timedelta(minutes=18)).timestamp()),
-            "end_time": int((meeting_time + timedelta(minutes=20)).timestamp()),
-            "speaker": {"name": name.split()[0] if name else "Customer"},
-            "words": "The main concern is making sure Emond is comfortable with the system. Also, we need to make sure it integrates well with our existing Adobe workflows."
+            "start_time": base + start * 60,
+            "end_time": base + end * 60,
+            "speaker": {"name": first_name if speaker is _CUSTOMER else speaker},
+            "words": words,
         }
+        for start, end, speaker, words in _DEMO_SCRIPT
     ]
     
     payload = {
@@ -199,7 +79,7 @@ def send_readai_webhook(base_url: str, email: str, name: str, meeting_time: date
         "start_time": meeting_time.isoformat(),
         "end_time": (meeting_time + timedelta(minutes=30)).isoformat(),
         "participants": [
-            {"name": name, "first_name": name.split()[0] if " " in name else name, "last_name": name.split()[-1] if " " in name else "", "email": email},
+            {"name": name, "first_name": first_name, "last_name": last_name, "email": email},
             {"name": "GV Rep", "first_name": "GV", "last_name": "Rep", "email": "rep@govisually.com"},
             {"name": "Sara", "first_name": "Sara", "last_name": "", "email": "sara@example.com"},
         ],
@@ -208,12 +88,13 @@ def send_readai_webhook(base_url: str, email: str, name: str, meeting_time: date
             "speaker_blocks": transcript_blocks,
             "speakers": [
                 {"name": "GV Rep"},
-                {"name": name.split()[0] if name else "Customer"},
+                {"name": first_name},
                 {"name": "Sara"},
             ]
         }
     }
     
+    raw_body = json_dumps(payload)
     headers = {"Content-Type": "application/json"}
     readai_secret = load_env_var("READAI_SHARED_SECRET", "")
     if readai_secret:
@@ -224,46 +105,16 @@ def send_readai_webhook(base_url: str, email: str, name: str, meeting_time: date
     print(f"   👥 Participants: {len(payload['participants'])}")
     print(f"   📝 Transcript blocks: {len(transcript_blocks)}")
     
-    response = requests.post(webhook_url, json=payload, headers=headers, timeout=30)
+    response = session.post("/webhooks/readai", content=raw_body, headers=headers)
     
     if response.status_code != 200:
         print(f"   ❌ Failed: {response.status_code} - {response.text}")
         return None
     
-    result = response.json()
+    result = json_loads(response.content)
     print(f"   ✅ Accepted: Event ID {result.get('event_id')}")
     return result
 
-def wait_for_processing(base_url: str, event_id: str, max_wait: int = 60, event_type: str = "event") -> bool:
-    """Wait for an event to be processed"""
-    print(f"\n   ⏳ Waiting for processing (max {max_wait}s)...")
-    
-    for i in range(max_wait // 2):
-        time.sleep(2)
-        try:
-            response = requests.get(f"{base_url}/debug/events/{event_id}", timeout=5)
-            if response.status_code == 200:
-                event_data = response.json()
-                status = event_data.get("status", "unknown")
-                print(f"      Status: {status}", end="\r")
-                if status in ["processed", "completed", "failed", "ignored"]:
-                    print()  # New line after status
-                    if status == "failed":
-                        error = event_data.get("last_error", "")
-                        print(f"   ⚠️  {event_type} failed: {error[:200]}")
-                        return False
-                    elif status == "processed":
-                        print(f"   ✅ {event_type} processed successfully")
-                        return True
-                    else:
-                        print(f"   ℹ️  {event_type} status: {status}")
-                        return True
-        except Exception as e:
-            print(f"      Error checking status: {e}", end="\r")
-    
-    print(f"\n   ⚠️  Timeout waiting for {event_type} to process")
-    return False
-
 def check_zoho_lead(email: str) -> dict | None:
     """Check if lead exists in Zoho (simplified - would need Zoho API)"""
     # In a real scenario, we'd query Zoho API here
@@ -272,31 +123,48 @@ def check_zoho_lead(email: str) -> dict | None:
     print(f"   ℹ️  (In production, this would query Zoho API to verify fields)")
     return {"email": email, "status": "would_check_zoho"}
 
-def show_worker_logs_summary(event_ids: list[str]):
-    """Show a summary of what was sent to Zoho from worker logs"""
-    print("\n   📊 Checking worker logs for Zoho operations...")
+_ZOHO_LOG_MARKERS = ("Creating Zoho Lead with", "Updating Zoho Lead", "Zoho Lead created", "Zoho update successful")
+_FIELD_LIST_RE = re.compile(r"with \d+ fields: \[(.*?)\]")
+
+def _grep_worker_logs(event_ids: list[str]) -> list[str]:
+    """Worker log lines mentioning any of event_ids, filtered by grep -F rather than in Python"""
+    logs = subprocess.Popen(
+        ["docker-compose", "logs", "--tail", "1000", "worker"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
     try:
-        import subprocess
-        result = subprocess.run(
-            ["docker-compose", "logs", "--tail", "1000", "worker"],
+        patterns = [arg for event_id in event_ids for arg in ("-e", event_id)]
+        grep = subprocess.run(
+            ["grep", "-F", *patterns],
+            stdin=logs.stdout,
             capture_output=True,
             text=True,
-            timeout=10
+            timeout=10,
         )
-        logs = result.stdout
+    finally:
+        logs.stdout.close()
+        logs.wait(timeout=10)
+    return [line for line in grep.stdout.splitlines() if any(m in line for m in _ZOHO_LOG_MARKERS)]
+
+def show_worker_logs_summary(event_ids: list[str]):
+    """Show a summary of what was sent to Zoho from worker logs"""
+    print("\n   📊 Checking worker logs for Zoho operations...")
+    event_ids = [event_id for event_id in event_ids if event_id]
+    if not event_ids:
+        return
+    try:
+        lines = _grep_worker_logs(event_ids)
         
         # Look for field lists in logs
         for event_id in event_ids:
-            if not event_id:
-                continue
-            event_logs = [line for line in logs.split("\n") if event_id in line]
-            
             # Find Creating/Updating Zoho messages
-            for line in event_logs:
+            for line in lines:
+                if event_id not in line:
+                    continue
                 if "Creating Zoho Lead with" in line or "Updating Zoho Lead" in line:
                     # Extract field list
-                    import re
-                    match = re.search(r"with \d+ fields: \[(.*?)\]", line)
+                    match = _FIELD_LIST_RE.search(line)
                     if match:
                         fields_str = match.group(1)
                         fields = [f.strip().strip("'\"") for f in fields_str.split(",")]
@@ -306,7 +174,7 @@ def show_worker_logs_summary(event_ids: list[str]):
                         if len(fields) > 10:
                             print(f"         ... and {len(fields) - 10} more")
                         break
-                elif "Zoho Lead created" in line or "Zoho update successful" in line:
+                else:
                     print(f"      ✅ {line.split('INFO')[-1].strip()}")
     except Exception as e:
         print(f"      ⚠️  Could not check logs: {e}")
@@ -328,19 +196,30 @@ def main():
     print(f"👤 Test Lead Name: {test_name}")
     print(f"📅 Demo Scheduled: {demo_time.strftime('%Y-%m-%d %H:%M %Z')}\n")
     
+    return run_flow(get_http_client(base_url), base_url, test_email, test_name, demo_time)
+
+def run_flow(session: httpx.Client, base_url: str, test_email: str, test_name: str, demo_time: datetime) -> int:
+    """Steps 1-3 of the flow, all over the shared session"""
     # STEP 1: Calendly Booking
     print_step(1, "Calendly Booking (invitee.created)")
-    calendly_result = send_calendly_webhook(base_url, test_email, test_name, demo_time)
+    print(f"   📤 Sending to: {base_url}/webhooks/calendly")
+    print(f"   👤 Attendee: {test_name} ({test_email})")
+    print(f"   📅 Event Time: {demo_time.strftime('%Y-%m-%d %H:%M %Z')}")
+    calendly_result = send_calendly_webhook(session, test_email, test_name, demo_time)
     if not calendly_result:
         print("\n❌ Calendly webhook failed. Aborting.")
         return 1
     
     calendly_event_id = calendly_result.get("event_id")
+    print(f"   ✅ Accepted: Event ID {calendly_event_id}")
     if calendly_result.get("ignored"):
         print(f"\n   ℹ️  Calendly event ignored: {calendly_result.get('reason', 'unknown')}")
         print(f"   (This is OK - event_type_uri filter may be active)")
     elif calendly_event_id:
-        if not wait_for_processing(base_url, calendly_event_id, max_wait=60, event_type="Calendly event"):
+        print("\n   ⏳ Waiting for processing (max 60s)...")
+        if wait_for_processing(session, calendly_event_id, max_wait=60):
+            print("   ✅ Calendly event processed")
+        else:
             print("\n⚠️  Calendly event processing had issues, but continuing...")
         print(f"\n   ✅ Step 1 Complete: Lead should be created/enriched in Zoho")
     else:
@@ -349,15 +228,17 @@ def main():
     
     # STEP 2: Demo Happens (Read.ai)
     print_step(2, "Demo Completion (Read.ai meeting_end)")
-    readai_result = send_readai_webhook(base_url, test_email, test_name, demo_time)
+    readai_result = send_readai_webhook(session, test_email, test_name, demo_time)
     if not readai_result:
         print("\n❌ Read.ai webhook failed. Aborting.")
         return 1
     
     readai_event_id = readai_result.get("event_id")
-    if not wait_for_processing(base_url, readai_event_id, max_wait=90, event_type="Read.ai event"):
+    print("\n   ⏳ Waiting for processing (max 90s)...")
+    if not wait_for_processing(session, readai_event_id, max_wait=90):
         print("\n⚠️  Read.ai event processing had issues")
         return 1
+    print("   ✅ Read.ai event processed")
     
     print(f"\n   ✅ Step 2 Complete: MEDDIC data should be extracted and sent to Zoho")
     time.sleep(2)
@@ -367,32 +248,26 @@ def main():
     
     # Check event statuses
     print("\n   📊 Event Status Summary:")
-    try:
-        if calendly_event_id:
-            cal_response = requests.get(f"{base_url}/debug/events/{calendly_event_id}", timeout=5)
-            if cal_response.status_code == 200:
-                cal_data = cal_response.json()
-                status = cal_data.get('status', 'unknown')
-                attempts = cal_data.get('attempts', 0)
-                print(f"      Calendly Event: {status} (attempts: {attempts})")
+    # The two lookups are independent; overlap them on the shared (thread-safe) client
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [
+            (label, pool.submit(session.get, f"/debug/events/{event_id}", timeout=5))
+            for label, event_id in (("Calendly Event", calendly_event_id), ("Read.ai Event", readai_event_id))
+            if event_id
+        ]
+    for label, future in futures:
+        try:
+            response = future.result()
+            if response.status_code == 200:
+                data = json_loads(response.content)
+                status = data.get('status', 'unknown')
+                attempts = data.get('attempts', 0)
+                print(f"      {label}: {status} (attempts: {attempts})")
                 if status == "failed":
-                    error = cal_data.get('last_error', '')[:200]
+                    error = data.get('last_error', '')[:200]
                     print(f"         Error: {error}")
-    except:
-        pass
-    
-    try:
-        rai_response = requests.get(f"{base_url}/debug/events/{readai_event_id}", timeout=5)
-        if rai_response.status_code == 200:
-            rai_data = rai_response.json()
-            status = rai_data.get('status', 'unknown')
-            attempts = rai_data.get('attempts', 0)
-            print(f"      Read.ai Event: {status} (attempts: {attempts})")
-            if status == "failed":
-                error = rai_data.get('last_error', '')[:200]
-                print(f"         Error: {error}")
-    except:
-        pass
+        except Exception:
+            pass
     
     # Show what was sent to Zoho from logs
     show_worker_logs_summary([calendly_event_id, readai_event_id])
@@ -3,72 +3,67 @@
 End-to-End Test with Zoho Verification
 Tests the full flow and actually queries Zoho to verify all fields are populated correctly.
 """
-import json
 import os
-import re
 import sys
 import time
 import uuid
-import hmac
-import hashlib
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-import requests
 import httpx
 
-def load_env_var(key: str, default: str = "") -> str:
-    env_file = Path(__file__).parent.parent / ".env"
-    if env_file.exists():
-        content = env_file.read_text()
-        match = re.search(rf"^{re.escape(key)}=(.+)$", content, flags=re.M)
-        if match:
-            return match.group(1).strip()
-    return default
+from _common import (
+    get_http_client,
+    get_zoho_access_token,
+    json_dumps,
+    load_env_var,
+    send_calendly_webhook,
+    wait_for_processing,
+    zoho_auth_headers,
+    zoho_dc_domain,
+)
+
+# Every column main() verifies; COQL returns just these (plus id) instead of the whole record
+_VERIFY_FIELDS = (
+    "Email", "First_Name", "Last_Name", "Lead_Status",
+    "MEDDIC_Process", "MEDDIC_Pain", "Competition", "Identified_Pain_Points",
+)
 
 def get_zoho_lead(email: str) -> dict | None:
     """Fetch lead from Zoho by email"""
-    dc = load_env_var("ZOHO_DC", "au")
-    refresh_token = load_env_var("ZOHO_REFRESH_TOKEN", "")
-    client_id = load_env_var("ZOHO_CLIENT_ID", "")
-    client_secret = load_env_var("ZOHO_CLIENT_SECRET", "")
     module = load_env_var("ZOHO_LEADS_MODULE", "Leads")
     
-    if not refresh_token:
+    if not load_env_var("ZOHO_REFRESH_TOKEN", ""):
         print("   ⚠️  ZOHO_REFRESH_TOKEN not set, skipping Zoho check")
         return None
     
-    # Get access token
-    token_url = f"https://accounts.zoho.{dc}/oauth/v2/token"
-    token_data = {
-        "refresh_token": refresh_token,
-        "client_id": client_id,
-        "client_secret": client_secret,
-        "grant_type": "refresh_token",
-    }
-    
     try:
-        with httpx.Client(timeout=10.0) as client:
-            token_resp = client.post(token_url, data=token_data)
-            token_resp.raise_for_status()
-            access_token = token_resp.json()["access_token"]
-            
-            # Search for lead
-            api_url = f"https://www.zohoapis.{dc}/crm/v2/{module}/search"
+        # Access token comes from the shared on-disk cache while still valid
+        dc_domain = zoho_dc_domain()
+        access_token = get_zoho_access_token(dc_domain)
+        headers = zoho_auth_headers(access_token)
+        api_base = f"https://www.zohoapis.{dc_domain}/crm/v2"
+        client = get_http_client()
+        
+        # Query only the verified columns
+        quoted_email = email.replace("\\", "\\\\").replace("'", "\\'")
+        select_query = f"SELECT {', '.join(_VERIFY_FIELDS)} FROM {module} WHERE Email = '{quoted_email}' LIMIT 1"
+        search_resp = client.post(f"{api_base}/coql", json={"select_query": select_query}, headers=headers, timeout=10.0)
+        if 400 <= search_resp.status_code < 500:
+            # Token without the ZohoCRM.coql.READ scope, or an org missing one of the custom
+            # fields (INVALID_QUERY): fall back to the full-record search
             params = {"criteria": f"(Email:equals:{email})"}
-            headers = {"Authorization": f"Zoho-oauthtoken {access_token}"}
-            
-            search_resp = client.get(api_url, params=params, headers=headers, timeout=10.0)
-            
-            if search_resp.status_code == 204:
-                return None
-            
-            search_resp.raise_for_status()
-            data = search_resp.json()
-            
-            if data.get("data") and len(data["data"]) > 0:
-                return data["data"][0]
-            
+            search_resp = client.get(f"{api_base}/{module}/search", params=params, headers=headers, timeout=10.0)
+        
+        if search_resp.status_code == 204:
             return None
+        
+        search_resp.raise_for_status()
+        data = search_resp.json()
+        
+        if data.get("data") and len(data["data"]) > 0:
+            return data["data"][0]
+        
+        return None
     except Exception as e:
         print(f"   ❌ Error fetching Zoho lead: {e}")
         return None
@@ -102,61 +97,13 @@ def verify_zoho_fields(lead: dict, expected_fields: dict, stage: str) -> dict:
     
     return results
 
-def send_calendly_webhook(base_url: str, email: str, name: str, event_time: datetime) -> dict:
-    """Send Calendly webhook with proper signature"""
-    webhook_url = f"{base_url.rstrip('/')}/webhooks/calendly"
-    invitee_uuid = str(uuid.uuid4())
-    event_uuid = str(uuid.uuid4())
-    
-    payload = {
-        "event": "invitee.created",
-        "time": event_time.isoformat(),
-        "payload": {
-            "invitee": {
-                "uuid": invitee_uuid,
-                "name": name,
-                "email": email,
-                "uri": f"https://api.calendly.com/scheduled_events/{event_uuid}/invitees/{invitee_uuid}",
-            },
-            "event": {
-                "uuid": event_uuid,
-                "uri": f"https://api.calendly.com/scheduled_events/{event_uuid}",
-                "start_time": event_time.isoformat(),
-                "end_time": (event_time + timedelta(minutes=30)).isoformat(),
-                "timezone": "America/New_York",
-            },
-            "event_type": {
-                "uri": load_env_var("CALENDLY_EVENT_TYPE_URI", "https://api.calendly.com/event_types/TEST123")
-            },
-            "questions_and_answers": [
-                {"question": "What's your role?", "answer": "Packaging Manager"},
-                {"question": "Company?", "answer": "Test Company Inc"}
-            ]
-        }
-    }
-    
-    headers = {"Content-Type": "application/json"}
-    calendly_key = load_env_var("CALENDLY_SIGNING_KEY", "")
-    if calendly_key:
-        timestamp = int(time.time())
-        raw_body = json.dumps(payload).encode("utf-8")
-        signed_payload = f"{timestamp}.".encode("utf-8") + raw_body
-        signature = hmac.new(calendly_key.encode("utf-8"), signed_payload, hashlib.sha256).hexdigest()
-        headers["Calendly-Webhook-Signature"] = f"t={timestamp},v1={signature}"
-    
-    response = requests.post(webhook_url, json=payload, headers=headers, timeout=30)
-    if response.status_code != 200:
-        print(f"   ❌ Calendly webhook failed: {response.status_code} - {response.text}")
-        return None
-    return response.json()
-
-def send_readai_webhook(base_url: str, email: str, name: str, meeting_time: datetime) -> dict:
+def send_readai_webhook(session: httpx.Client, email: str, name: str, meeting_time: datetime) -> dict:
     """Send Read.ai webhook"""
-    webhook_url = f"{base_url.rstrip('/')}/webhooks/readai"
     session_id = f"verify-{uuid.uuid4().hex[:12]}"
     
-    first_name = name.split()[0] if " " in name else name
-    last_name = name.split()[-1] if " " in name and len(name.split()) > 1 else ""
+    parts = name.split()
+    first_name = parts[0] if parts else name
+    last_name = parts[-1] if len(parts) > 1 else ""
     
     payload = {
         "session_id": session_id,
@@ -193,26 +140,20 @@ def send_readai_webhook(base_url: str, email: str, name: str, meeting_time: date
     if readai_secret:
         headers["X-ReadAI-Secret"] = readai_secret
     
-    response = requests.post(webhook_url, json=payload, headers=headers, timeout=30)
+    response = session.post("/webhooks/readai", content=json_dumps(payload), headers=headers, timeout=30)
     if response.status_code != 200:
         print(f"   ❌ Read.ai webhook failed: {response.status_code} - {response.text}")
         return None
     return response.json()
 
-def wait_for_processing(base_url: str, event_id: str, max_wait: int = 60) -> bool:
-    """Wait for event processing"""
-    for i in range(max_wait // 2):
-        time.sleep(2)
-        try:
-            response = requests.get(f"{base_url}/debug/events/{event_id}", timeout=5)
-            if response.status_code == 200:
-                event_data = response.json()
-                status = event_data.get("status", "unknown")
-                if status in ["processed", "completed", "failed"]:
-                    return status == "processed" or status == "completed"
-        except:
-            pass
-    return False
+def _warm_zoho_token() -> None:
+    """Fetch (or load from the on-disk cache) the Zoho access token; get_zoho_lead reports any failure"""
+    if not load_env_var("ZOHO_REFRESH_TOKEN", ""):
+        return
+    try:
+        get_zoho_access_token(zoho_dc_domain())
+    except Exception:
+        pass
 
 def main():
     print("="*70)
@@ -220,6 +161,7 @@ def main():
     print("="*70)
     
     base_url = load_env_var("BASE_URL", "http://localhost:8000")
+    session = get_http_client(base_url)
     test_email = f"verify-{uuid.uuid4().hex[:8]}@example.com"
     test_name = "John Smith"
     demo_time = datetime.now(timezone.utc) + timedelta(days=2, hours=10)
@@ -227,17 +169,23 @@ def main():
     print(f"\n📧 Test Lead: {test_name} ({test_email})")
     print(f"📅 Demo Time: {demo_time.strftime('%Y-%m-%d %H:%M %Z')}\n")
     
+    # Both steps drive the same lead, so they stay sequential; the Zoho token
+    # doesn't depend on them and is fetched in the background during STEP 1
+    token_pool = ThreadPoolExecutor(max_workers=1)
+    token_warmup = token_pool.submit(_warm_zoho_token)
+    token_pool.shutdown(wait=False)
+    
     # STEP 1: Calendly Booking
     print("STEP 1: Calendly Booking")
     print("-" * 70)
-    calendly_result = send_calendly_webhook(base_url, test_email, test_name, demo_time)
+    calendly_result = send_calendly_webhook(session, test_email, test_name, demo_time)
     if not calendly_result:
         return 1
     
     calendly_event_id = calendly_result.get("event_id")
     if calendly_event_id:
         print(f"   ✅ Event ID: {calendly_event_id}")
-        if wait_for_processing(base_url, calendly_event_id, max_wait=60):
+        if wait_for_processing(session, calendly_event_id, max_wait=60):
             print("   ✅ Processed successfully")
         else:
             print("   ⚠️  Processing timeout or failed")
@@ -247,6 +195,7 @@ def main():
     # Wait a bit for Zoho to update
     print("\n   ⏳ Waiting 5s for Zoho update...")
     time.sleep(5)
+    token_warmup.result()
     
     # Verify Calendly fields in Zoho
     lead = get_zoho_lead(test_email)
@@ -270,13 +219,13 @@ def main():
     # STEP 2: Read.ai Demo Completion
     print("\n\nSTEP 2: Read.ai Demo Completion")
     print("-" * 70)
-    readai_result = send_readai_webhook(base_url, test_email, test_name, demo_time)
+    readai_result = send_readai_webhook(session, test_email, test_name, demo_time)
     if not readai_result:
         return 1
     
     readai_event_id = readai_result.get("event_id")
     print(f"   ✅ Event ID: {readai_event_id}")
-    if wait_for_processing(base_url, readai_event_id, max_wait=90):
+    if wait_for_processing(session, readai_event_id, max_wait=90):
         print("   ✅ Processed successfully")
     else:
         print("   ❌ Processing failed")
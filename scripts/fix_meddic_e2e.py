@@ -4,71 +4,63 @@ Automated E2E test and fix script for MEDDIC extraction.
 Runs test, checks Zoho, identifies issues, and suggests fixes.
 """
 import json
-import os
 import re
 import sys
 import time
 import uuid
-from pathlib import Path
 from datetime import datetime, timezone
-import requests
 import subprocess
 
-def load_env_var(key: str, default: str = "") -> str:
-    env_file = Path(__file__).parent.parent / ".env"
-    if env_file.exists():
-        content = env_file.read_text()
-        match = re.search(rf"^{re.escape(key)}=(.+)$", content, flags=re.M)
-        if match:
-            return match.group(1).strip()
-    return default
+from _common import get_http_client, load_env_var
 
-def send_test_webhook() -> dict:
-    """Send test webhook with rich MEDDIC content"""
+def send_test_webhook() -> tuple[dict | None, str]:
+    """Send test webhook with rich MEDDIC content; returns (response body, test lead email)"""
     base_url = load_env_var("BASE_URL", "http://localhost:8000")
-    webhook_url = f"{base_url.rstrip('/')}/webhooks/readai"
     session_id = f"fix-test-{uuid.uuid4().hex[:12]}"
+    email = f"meddic-test-{uuid.uuid4().hex[:8]}@example.com"
+    now = datetime.now(timezone.utc)
+    t0 = int(now.timestamp())
     
     payload = {
         "session_id": session_id,
         "trigger": "meeting_end",
         "title": "MEDDIC Test - Full Extraction",
-        "start_time": datetime.now(timezone.utc).isoformat(),
-        "end_time": (datetime.now(timezone.utc).replace(second=0, microsecond=0)).isoformat(),
+        "start_time": now.isoformat(),
+        "end_time": now.replace(second=0, microsecond=0).isoformat(),
         "participants": [
-            {"name": "Test Lead", "first_name": "Test", "last_name": "Lead", "email": f"meddic-test-{uuid.uuid4().hex[:8]}@example.com"},
+            {"name": "Test Lead", "first_name": "Test", "last_name": "Lead", "email": email},
             {"name": "GV Rep", "first_name": "GV", "last_name": "Rep", "email": "rep@govisually.com"},
         ],
         "summary": "Test meeting with explicit MEDDIC information: Need to reduce approval time from 3 months to 4 weeks. Currently using Workfront which is slow. Decision criteria includes Adobe integration and compliance features. Will evaluate 3 vendors by Q2. Sara is very excited. IT Director John approves budget.",
         "transcript": {
             "speaker_blocks": [
                 {
-                    "start_time": int(time.time()),
-                    "end_time": int(time.time()) + 10,
+                    "start_time": t0,
+                    "end_time": t0 + 10,
                     "speaker": {"name": "Test Lead"},
                     "words": "We need to reduce our artwork approval time from 3 months to 4 weeks. Our current process is a nightmare and takes way too long. We're currently using Workfront but it's too slow and frustrating."
                 },
                 {
-                    "start_time": int(time.time()) + 10,
-                    "end_time": int(time.time()) + 20,
+                    "start_time": t0 + 10,
+                    "end_time": t0 + 20,
                     "speaker": {"name": "GV Rep"},
                     "words": "GoVisually can help with that. We integrate with Adobe and have compliance features."
                 },
                 {
-                    "start_time": int(time.time()) + 20,
-                    "end_time": int(time.time()) + 30,
+                    "start_time": t0 + 20,
+                    "end_time": t0 + 30,
                     "speaker": {"name": "Test Lead"},
                     "words": "Integration with Adobe is important for us. We also need compliance features for FDA regulations. We'll need to evaluate 3 vendors and make a decision by Q2. IT Director John needs to approve the budget."
                 },
                 {
-                    "start_time": int(time.time()) + 30,
-                    "end_time": int(time.time()) + 40,
+                    "start_time": t0 + 30,
+                    "end_time": t0 + 40,
                     "speaker": {"name": "Sara"},
                     "words": "I'm really excited about this! This could solve our biggest pain point. We need to get pricing and schedule a technical demo with Emund."
                 },
                 {
-                    "start_time": int(time.time()) + 40,
-                    "end_time": int(time.time()) + 50,
+                    "start_time": t0 + 40,
+                    "end_time": t0 + 50,
                     "speaker": {"name": "Test Lead"},
                     "words": "Let's schedule a follow-up meeting. We're also comparing with other vendors but GoVisually looks promising."
                 },
@@ -86,52 +78,70 @@ def send_test_webhook() -> dict:
     if readai_secret:
         headers["X-ReadAI-Secret"] = readai_secret
     
-    response = requests.post(webhook_url, json=payload, headers=headers, timeout=30)
+    response = get_http_client(base_url).post("/webhooks/readai", json=payload, headers=headers, timeout=30)
     if response.status_code != 200:
         print(f"❌ Webhook failed: {response.status_code}")
-        return None
-    return response.json()
+        return None, email
+    return response.json(), email
 
-def check_worker_logs(event_id: str, max_wait: int = 60) -> dict:
+_MEDDIC_FIELD_RE = re.compile(r'(\w+)=(\d+)\s+chars')
+_CONF_RE = re.compile(r'confidence=(\w+)')
+
+def check_worker_logs(event_id: str, max_wait: int = 60, since: str | None = None) -> dict:
     """Check worker logs for LLM extraction results"""
     print(f"\n⏳ Waiting for processing (max {max_wait}s)...")
     
-    base_url = load_env_var("BASE_URL", "http://localhost:8000")
-    for i in range(max_wait // 2):
-        time.sleep(2)
+    session = get_http_client(load_env_var("BASE_URL", "http://localhost:8000"))
+    # Poll right away, backing off from 100ms to 2s, rather than a fixed 2s sleep per check
+    delay = 0.1
+    deadline = time.monotonic() + max_wait
+    while True:
         try:
-            response = requests.get(f"{base_url}/debug/events/{event_id}", timeout=5)
+            response = session.get(f"/debug/events/{event_id}", timeout=5)
             if response.status_code == 200:
                 event_data = response.json()
                 status = event_data.get("status", "unknown")
                 if status in ["processed", "completed", "failed", "ignored"]:
                     break
-        except:
+        except Exception:
             pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 1.5, 2.0)
     
-    # Get worker logs
+    # Get worker logs: stream them instead of buffering the whole dump
+    window = ["--since", since] if since else ["--tail", "200"]
     try:
-        result = subprocess.run(
-            ["docker-compose", "logs", "--tail", "200", "worker"],
-            capture_output=True,
+        proc = subprocess.Popen(
+            ["docker-compose", "logs", *window, "worker"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-            timeout=10
         )
-        logs = result.stdout
+        try:
+            # Since this run started, the first MEDDIC line is ours; with --tail the latest one wins.
+            # Only that one line is kept and parsed, however long the log is
+            meddic_line = None
+            for line in proc.stdout:
+                if "LLM extracted MEDDIC:" in line:
+                    meddic_line = line
+                    if since:
+                        break
+        finally:
+            proc.kill()
+            proc.wait()
         
         # Extract LLM extraction results
         extraction = {}
-        for line in logs.split("\n"):
-            if "LLM extracted MEDDIC:" in line:
-                # Parse: metrics=54 chars, economic_buyer=45 chars, ...
-                matches = re.findall(r'(\w+)=(\d+)\s+chars', line)
-                for field, count in matches:
-                    extraction[field] = int(count)
-                if "confidence=" in line:
-                    conf_match = re.search(r'confidence=(\w+)', line)
-                    if conf_match:
-                        extraction["confidence"] = conf_match.group(1)
-        
+        if meddic_line:
+            # Parse: metrics=54 chars, economic_buyer=45 chars, ...
+            for field, count in _MEDDIC_FIELD_RE.findall(meddic_line):
+                extraction[field] = int(count)
+            conf_match = _CONF_RE.search(meddic_line)
+            if conf_match:
+                extraction["confidence"] = conf_match.group(1)
         return extraction
     except Exception as e:
         print(f"⚠️  Error checking logs: {e}")
@@ -143,18 +153,19 @@ def main():
     
     # Step 1: Send webhook
     print("\n1️⃣  Sending test webhook...")
-    result = send_test_webhook()
+    test_start = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    result, email = send_test_webhook()
     if not result:
         return 1
     
     event_id = result.get("event_id")
-    email = f"meddic-test-{uuid.uuid4().hex[:8]}@example.com"  # Extract from payload
     
     print(f"   ✅ Event ID: {event_id}")
+    print(f"   📧 Test lead: {email}")
     
     # Step 2: Wait and check extraction
     print("\n2️⃣  Checking LLM extraction...")
-    extraction = check_worker_logs(event_id)
+    extraction = check_worker_logs(event_id, since=test_start)
     
     if not extraction:
         print("   ⚠️  Could not get extraction results from logs")
@@ -4,10 +4,10 @@ Inspect Intercom company to see what product usage signals are stored at company
 
 Usage:
     python3 scripts/inspect_intercom_company.py <company_id>
-    python3 scripts/inspect_intercom_company.py --search "Calvary Design Team"
+    python3 scripts/inspect_intercom_company.py --search "Calvary Design Team" [--exhaustive]
 """
 
-import json
+import asyncio
 import sys
 from pathlib import Path
 
@@ -16,13 +16,18 @@ import httpx
 # Add parent directory to path to import app modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from app.services.http_client import get_ssl_context
 from app.settings import get_settings
 
+from _common import json_dumps, json_loads
 
-def get_company_by_id(company_id: str) -> dict | None:
+
+def get_company_by_id(company_id: str) -> tuple[dict, bytes] | None:
     """
     Get Intercom company by ID.
 
+    Returns (company, raw response body) so the body can be saved without re-serializing.
+
     https://developers.intercom.com/docs/references/rest-api/api.intercom.io/Companies/GetCompany/
     """
     settings = get_settings()
@@ -46,7 +51,7 @@ def get_company_by_id(company_id: str) -> dict | None:
             timeout=30
         )
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content), response.content
 
     except httpx.HTTPStatusError as e:
         print(f"❌ API error: {e.response.status_code}")
@@ -57,10 +62,12 @@ def get_company_by_id(company_id: str) -> dict | None:
         return None
 
 
-def search_company_by_name(name: str) -> list[dict]:
+async def search_company_by_name_async(name: str, exhaustive: bool = False) -> list[dict]:
     """
     Search for companies by name.
 
+    Stops after the first scroll page that has a match unless exhaustive=True.
+
     https://developers.intercom.com/docs/references/rest-api/api.intercom.io/Companies/ScrollCompanies/
     """
     settings = get_settings()
@@ -74,38 +81,44 @@ def search_company_by_name(name: str) -> list[dict]:
 
     print(f"🔍 Searching for companies matching: {name}")
 
-    # Use scroll API to list all companies (Intercom doesn't have company search by name)
-    all_companies = []
-    scroll_param = None
+    # Use scroll API to list companies (Intercom doesn't have company search by name),
+    # filtering each page as it arrives (case-insensitive partial match)
+    name_folded = name.casefold()
+    matching = []
+    scanned = 0
+    url = "https://api.intercom.io/companies/scroll"
 
     try:
-        while True:
-            url = "https://api.intercom.io/companies/scroll"
-            if scroll_param:
-                url += f"?scroll_param={scroll_param}"
-
-            response = httpx.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-
-            data = response.json()
-            companies = data.get("data", [])
-            all_companies.extend(companies)
-
-            scroll_param = data.get("scroll_param")
-            if not scroll_param:
-                break
-
-            # Limit to prevent infinite loops
-            if len(all_companies) > 1000:
-                print("⚠️  Reached 1000 companies limit, stopping search")
-                break
-
-        # Filter by name (case-insensitive partial match)
-        name_lower = name.lower()
-        matching = [
-            c for c in all_companies
-            if name_lower in c.get("name", "").lower()
-        ]
+        # One keep-alive client for every scroll page instead of a TLS handshake per page
+        async with httpx.AsyncClient(timeout=30, verify=get_ssl_context(http2=True), http2=True) as client:
+            next_page = asyncio.create_task(client.get(url, headers=headers))
+            while next_page is not None:
+                response = await next_page
+                next_page = None
+                response.raise_for_status()
+
+                data = json_loads(response.content)
+                companies = data.get("data", [])
+                scanned += len(companies)
+
+                # Scroll pages are strictly serial, but the next one can be in flight
+                # while this one is filtered
+                scroll_param = data.get("scroll_param")
+                if scroll_param and scanned <= 1000:
+                    next_page = asyncio.create_task(
+                        client.get(url, params={"scroll_param": scroll_param}, headers=headers)
+                    )
+
+                matching.extend(c for c in companies if name_folded in (c.get("name") or "").casefold())
+                if matching and not exhaustive:
+                    break
+
+                # Limit to prevent infinite loops
+                if scroll_param and scanned > 1000:
+                    print("⚠️  Reached 1000 companies limit, stopping search")
+
+            if next_page is not None:
+                next_page.cancel()
 
         return matching
 
@@ -114,6 +127,66 @@ def search_company_by_name(name: str) -> list[dict]:
         return []
 
 
+def search_company_by_name(name: str, exhaustive: bool = False) -> list[dict]:
+    """Search for companies by name"""
+    return asyncio.run(search_company_by_name_async(name, exhaustive))
+
+
+def _first(attrs: dict, *keys: str, default=None):
+    """Value of the first key that is set (not missing or None); unlike `a or b`, keeps 0 and "" values."""
+    return next((attrs[k] for k in keys if attrs.get(k) is not None), default)
+
+
+def _on_team_plan(usage: dict) -> bool:
+    return usage["plan_type"] in ("team", "Team")
+
+
+def _join_features(features) -> str:
+    return ", ".join(features) if isinstance(features, list) else features
+
+
+# Expansion signals as (applies, build) pairs over (usage_indicators, custom_attributes), checked in order
+_SIGNAL_RULES = (
+    (
+        lambda u, ca: _on_team_plan(u) and u["teammates_count"] and u["teammates_count"] >= 8,
+        lambda u, ca: {
+            "signal": "team_size_limit",
+            "details": f"{u['teammates_count']}/10 users (approaching limit)",
+            "action": "Offer Enterprise plan upgrade",
+            "priority": "high"
+        },
+    ),
+    (
+        lambda u, ca: _on_team_plan(u) and u["storage_percent"] and u["storage_percent"] >= 80,
+        lambda u, ca: {
+            "signal": "storage_threshold",
+            "details": f"{u['storage_percent']}% storage used",
+            "action": "Upsell more storage or Enterprise",
+            "priority": "high" if u["storage_percent"] >= 90 else "medium"
+        },
+    ),
+    (
+        lambda u, ca: _on_team_plan(u) and u["projects_count"] and u["projects_count"] >= 20,
+        lambda u, ca: {
+            "signal": "power_user",
+            "details": f"{u['projects_count']} projects created",
+            "action": "Check in about advanced needs",
+            "priority": "medium"
+        },
+    ),
+    (
+        # Check for enterprise features
+        lambda u, ca: ca.get("enterprise_features_tried"),
+        lambda u, ca: {
+            "signal": "enterprise_feature_interest",
+            "details": f"Tried: {_join_features(ca['enterprise_features_tried'])}",
+            "action": "Sales call to discuss Enterprise",
+            "priority": "high"
+        },
+    ),
+)
+
+
 def analyze_company_usage_signals(company: dict) -> dict:
     """
     Analyze company data for product usage signals.
@@ -146,12 +219,12 @@ def analyze_company_usage_signals(company: dict) -> dict:
     signals["custom_attributes"] = custom_attrs
 
     # Extract usage indicators
-    plan_type = custom_attrs.get("plan_type") or custom_attrs.get("plan")
+    plan_type = _first(custom_attrs, "plan_type", "plan")
     projects_count = custom_attrs.get("projects_count")
-    teammates_count = custom_attrs.get("teammates_count") or custom_attrs.get("users_count") or custom_attrs.get("team_size")
-    storage_used = custom_attrs.get("storage_used_mb") or custom_attrs.get("storage_used")
+    teammates_count = _first(custom_attrs, "teammates_count", "users_count", "team_size")
+    storage_used = _first(custom_attrs, "storage_used_mb", "storage_used")
     storage_percent = custom_attrs.get("storage_percent")
-    last_active = custom_attrs.get("last_active") or custom_attrs.get("last_activity_date")
+    last_active = _first(custom_attrs, "last_active", "last_activity_date")
 
     signals["usage_indicators"] = {
         "plan_type": plan_type,
@@ -163,155 +236,133 @@ def analyze_company_usage_signals(company: dict) -> dict:
     }
 
     # Detect expansion signals
-    if plan_type in ["team", "Team"]:
-        if teammates_count and teammates_count >= 8:
-            signals["expansion_signals"].append({
-                "signal": "team_size_limit",
-                "details": f"{teammates_count}/10 users (approaching limit)",
-                "action": "Offer Enterprise plan upgrade",
-                "priority": "high"
-            })
-
-        if storage_percent and storage_percent >= 80:
-            signals["expansion_signals"].append({
-                "signal": "storage_threshold",
-                "details": f"{storage_percent}% storage used",
-                "action": "Upsell more storage or Enterprise",
-                "priority": "high" if storage_percent >= 90 else "medium"
-            })
-
-        if projects_count and projects_count >= 20:
-            signals["expansion_signals"].append({
-                "signal": "power_user",
-                "details": f"{projects_count} projects created",
-                "action": "Check in about advanced needs",
-                "priority": "medium"
-            })
-
-    # Check for enterprise features
-    enterprise_features = custom_attrs.get("enterprise_features_tried", [])
-    if enterprise_features:
-        signals["expansion_signals"].append({
-            "signal": "enterprise_feature_interest",
-            "details": f"Tried: {', '.join(enterprise_features) if isinstance(enterprise_features, list) else enterprise_features}",
-            "action": "Sales call to discuss Enterprise",
-            "priority": "high"
-        })
+    for applies, build in _SIGNAL_RULES:
+        if applies(signals["usage_indicators"], custom_attrs):
+            signals["expansion_signals"].append(build(signals["usage_indicators"], custom_attrs))
 
     return signals
 
 
 def print_company_overview(company: dict):
     """Print company overview in a readable format."""
-    print("\n" + "="*80)
-    print("🏢 COMPANY OVERVIEW")
-    print("="*80)
-
-    print(f"\n📋 Basic Info:")
-    print(f"   Name: {company.get('name')}")
-    print(f"   ID: {company.get('id')}")
-    print(f"   Company ID: {company.get('company_id', 'N/A')}")
-    print(f"   Website: {company.get('website', 'N/A')}")
-    print(f"   Industry: {company.get('industry', 'N/A')}")
-    print(f"   Size: {company.get('size', 'N/A')} employees")
+    out = []  # written in one go at the end rather than a print() per line
+    out.append("\n" + "="*80)
+    out.append("🏢 COMPANY OVERVIEW")
+    out.append("="*80)
+
+    out.append(f"\n📋 Basic Info:")
+    out.append(f"   Name: {company.get('name')}")
+    out.append(f"   ID: {company.get('id')}")
+    out.append(f"   Company ID: {company.get('company_id', 'N/A')}")
+    out.append(f"   Website: {company.get('website', 'N/A')}")
+    out.append(f"   Industry: {company.get('industry', 'N/A')}")
+    out.append(f"   Size: {company.get('size', 'N/A')} employees")
 
     # Plan info
     plan = company.get("plan")
     if plan:
-        print(f"\n💳 Plan:")
-        print(f"   Name: {plan.get('name', 'N/A')}")
-        print(f"   ID: {plan.get('id', 'N/A')}")
+        out.append(f"\n💳 Plan:")
+        out.append(f"   Name: {plan.get('name', 'N/A')}")
+        out.append(f"   ID: {plan.get('id', 'N/A')}")
 
     # Timestamps
     created = company.get("created_at")
     updated = company.get("updated_at")
-    print(f"\n📅 Activity:")
-    print(f"   Created: {created if created else 'N/A'}")
-    print(f"   Last updated: {updated if updated else 'N/A'}")
+    out.append(f"\n📅 Activity:")
+    out.append(f"   Created: {created if created else 'N/A'}")
+    out.append(f"   Last updated: {updated if updated else 'N/A'}")
 
     # Monthly spend
     monthly_spend = company.get("monthly_spend")
     if monthly_spend:
-        print(f"\n💰 Revenue:")
-        print(f"   Monthly spend: ${monthly_spend}")
+        out.append(f"\n💰 Revenue:")
+        out.append(f"   Monthly spend: ${monthly_spend}")
 
     # User count
     user_count = company.get("user_count")
     if user_count:
-        print(f"\n👥 Users:")
-        print(f"   Total users: {user_count}")
+        out.append(f"\n👥 Users:")
+        out.append(f"   Total users: {user_count}")
 
     # Session count
     session_count = company.get("session_count")
     if session_count:
-        print(f"   Total sessions: {session_count}")
+        out.append(f"   Total sessions: {session_count}")
 
     # Tags
     tags = company.get("tags", {}).get("data", [])
     if tags:
         tag_names = [t.get("name") for t in tags]
-        print(f"\n🏷️  Tags ({len(tags)}): {', '.join(tag_names)}")
+        out.append(f"\n🏷️  Tags ({len(tags)}): {', '.join(tag_names)}")
 
     # Custom attributes
     custom_attrs = company.get("custom_attributes", {})
     if custom_attrs:
-        print(f"\n⚙️  Custom Attributes ({len(custom_attrs)}):")
+        out.append(f"\n⚙️  Custom Attributes ({len(custom_attrs)}):")
         for key, value in custom_attrs.items():
             # Format value nicely
             if isinstance(value, list):
                 value_str = f"[{', '.join(str(v) for v in value)}]"
             else:
                 value_str = str(value)
-            print(f"   {key}: {value_str}")
+            out.append(f"   {key}: {value_str}")
     else:
-        print(f"\n⚠️  No custom attributes found")
-        print(f"   (This is where GoVisually usage data should be stored)")
+        out.append(f"\n⚠️  No custom attributes found")
+        out.append(f"   (This is where GoVisually usage data should be stored)")
+
+    sys.stdout.write("\n".join(out) + "\n")
+
+
+_PRIORITY_EMOJI = {"high": "🔥", "medium": "⚡", "low": "📌"}
 
 
 def print_usage_signals(signals: dict):
     """Print detected usage signals."""
-    print("\n" + "="*80)
-    print("🎯 PRODUCT USAGE SIGNALS ANALYSIS")
-    print("="*80)
+    out = []  # written in one go at the end rather than a print() per line
+    out.append("\n" + "="*80)
+    out.append("🎯 PRODUCT USAGE SIGNALS ANALYSIS")
+    out.append("="*80)
 
     # Usage indicators
     usage = signals["usage_indicators"]
-    print(f"\n📊 Current Usage Indicators:")
+    out.append(f"\n📊 Current Usage Indicators:")
     for key, value in usage.items():
         if value is not None:
-            print(f"   ✅ {key}: {value}")
+            out.append(f"   ✅ {key}: {value}")
         else:
-            print(f"   ❌ {key}: NOT TRACKED")
+            out.append(f"   ❌ {key}: NOT TRACKED")
 
     # Expansion signals
     expansion = signals["expansion_signals"]
     if expansion:
-        print(f"\n🚀 EXPANSION SIGNALS DETECTED ({len(expansion)}):")
+        out.append(f"\n🚀 EXPANSION SIGNALS DETECTED ({len(expansion)}):")
         for i, signal in enumerate(expansion, 1):
-            priority_emoji = {"high": "🔥", "medium": "⚡", "low": "📌"}.get(signal.get("priority", "medium"), "📌")
-            print(f"\n   {i}. {priority_emoji} {signal['signal'].upper()} [{signal.get('priority', 'medium').upper()}]")
-            print(f"      Details: {signal['details']}")
-            print(f"      → Action: {signal['action']}")
+            priority_emoji = _PRIORITY_EMOJI.get(signal.get("priority", "medium"), "📌")
+            out.append(f"\n   {i}. {priority_emoji} {signal['signal'].upper()} [{signal.get('priority', 'medium').upper()}]")
+            out.append(f"      Details: {signal['details']}")
+            out.append(f"      → Action: {signal['action']}")
     else:
-        print(f"\n✅ No expansion signals detected")
+        out.append(f"\n✅ No expansion signals detected")
 
     # Churn risks
     churn = signals["churn_risks"]
     if churn:
-        print(f"\n⚠️  CHURN RISKS DETECTED ({len(churn)}):")
+        out.append(f"\n⚠️  CHURN RISKS DETECTED ({len(churn)}):")
         for i, risk in enumerate(churn, 1):
-            print(f"\n   {i}. {risk['risk'].upper()}")
-            print(f"      Details: {risk['details']}")
-            print(f"      → Action: {risk['action']}")
+            out.append(f"\n   {i}. {risk['risk'].upper()}")
+            out.append(f"      Details: {risk['details']}")
+            out.append(f"      → Action: {risk['action']}")
     else:
-        print(f"\n✅ No churn risks detected")
+        out.append(f"\n✅ No churn risks detected")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():
     if len(sys.argv) < 2:
         print("Usage:")
         print("  python3 scripts/inspect_intercom_company.py <company_id>")
-        print("  python3 scripts/inspect_intercom_company.py --search \"Company Name\"")
+        print("  python3 scripts/inspect_intercom_company.py --search \"Company Name\" [--exhaustive]")
         print("\nExample:")
         print("  python3 scripts/inspect_intercom_company.py 6631059bebbd37855746fc2d")
         print("  python3 scripts/inspect_intercom_company.py --search \"Calvary Design Team\"")
@@ -323,7 +374,7 @@ def main():
             sys.exit(1)
 
         search_term = sys.argv[2]
-        companies = search_company_by_name(search_term)
+        companies = search_company_by_name(search_term, exhaustive="--exhaustive" in sys.argv[3:])
 
         if not companies:
             print(f"\n❌ No companies found matching: {search_term}")
@@ -333,18 +384,20 @@ def main():
         for i, comp in enumerate(companies, 1):
             print(f"   {i}. {comp.get('name')} (ID: {comp.get('id')})")
 
-        # Use first match
+        # Use first match (scroll pages carry no per-company body, so it is serialized on save)
         company = companies[0]
+        raw_body = None
         if len(companies) > 1:
             print(f"\n📌 Using first match: {company.get('name')}")
 
     else:
         company_id = sys.argv[1]
-        company = get_company_by_id(company_id)
+        fetched = get_company_by_id(company_id)
 
-        if not company:
+        if not fetched:
             print("\n❌ Could not retrieve company data")
             sys.exit(1)
+        company, raw_body = fetched
 
     print(f"\n✅ Retrieved company: {company.get('name')}")
 
@@ -357,8 +410,12 @@ def main():
 
     # Save raw data to file for inspection
     output_file = Path(__file__).parent.parent / "company_data.json"
-    with open(output_file, "w") as f:
-        json.dump(company, f, indent=2)
+    # Write Intercom's body as received when we have it; otherwise compact JSON (pretty-print on demand
+    # with `python -m json.tool company_data.json`)
+    if raw_body is not None:
+        output_file.write_bytes(raw_body)
+    else:
+        output_file.write_bytes(json_dumps(company))
 
     print("\n" + "="*80)
     print(f"💾 Full company data saved to: {output_file}")
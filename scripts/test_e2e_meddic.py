@@ -4,8 +4,6 @@ End-to-end test for Read.ai MEDDIC extraction and Zoho updates.
 Sends webhook, waits for processing, checks Zoho, and reports what's missing.
 """
 import json
-import os
-import re
 import sys
 import time
 from pathlib import Path
@@ -16,17 +14,7 @@ import uuid
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-def load_env_var(key: str, default: str = "") -> str:
-    """Load environment variable from .env file or environment"""
-    if key in os.environ:
-        return os.environ[key]
-    env_file = Path(__file__).parent.parent / ".env"
-    if env_file.exists():
-        content = env_file.read_text()
-        match = re.search(rf"^{re.escape(key)}=(.+)$", content, flags=re.M)
-        if match:
-            return match.group(1).strip()
-    return default
+from _common import load_env_var
 
 def get_zoho_lead(email: str) -> dict | None:
     """Fetch lead from Zoho by email using API"""
@@ -10,29 +10,15 @@ This simulates the complete flow:
 5. System updates Zoho Lead with MEDDIC fields
 """
 import json
-import os
-import re
 import sys
 import time
 import uuid
 import hmac
 import hashlib
-from pathlib import Path
 from datetime import datetime, timezone, timedelta
 import httpx
 
-
-def load_env_var(key: str, default: str = "") -> str:
-    """Load environment variable from .env file or environment"""
-    if key in os.environ:
-        return os.environ[key]
-    env_file = Path(__file__).parent.parent / ".env"
-    if env_file.exists():
-        content = env_file.read_text()
-        match = re.search(rf"^{re.escape(key)}=(.+)$", content, flags=re.M)
-        if match:
-            return match.group(1).strip()
-    return default
+from _common import load_env_var
 
 
 def generate_calendly_signature(timestamp: int, raw_body: bytes, secret: str) -> str:
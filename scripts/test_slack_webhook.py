@@ -64,10 +64,9 @@ def load_env_file(env_path: str) -> dict[str, str]:
 
 def _reset_settings_cache():
     """Reset the Settings singleton cache to pick up new environment variables"""
-    import app.settings as settings_module
-    # Access the private _settings variable to reset it
-    if hasattr(settings_module, '_settings'):
-        settings_module._settings = None
+    from app.settings import get_settings
+
+    get_settings.cache_clear()
 
 
 def test_simple_alert(webhook_url: str | None = None):
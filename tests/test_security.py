@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import time
+
+from app.util.security import verify_calendly_signature
+
+
+def _header(key: str, body: bytes, ts: int) -> str:
+    sig = hmac.new(key.encode("utf-8"), f"{ts}.".encode("utf-8") + body, hashlib.sha256).hexdigest()
+    return f"t={ts},v1={sig}"
+
+
+def test_verify_calendly_signature_accepts_valid_signature():
+    body = b'{"event":"invitee.created"}'
+    header = _header("secret", body, int(time.time()))
+
+    check = verify_calendly_signature(signing_key="secret", header_value=header, raw_body=body)
+
+    assert check.ok
+
+
+def test_verify_calendly_signature_rejects_bad_input():
+    body = b'{"event":"invitee.created"}'
+    now = int(time.time())
+
+    def reason(header):
+        check = verify_calendly_signature(signing_key="secret", header_value=header, raw_body=body)
+        assert not check.ok
+        return check.reason
+
+    assert reason(None) == "missing_signature_header"
+    assert reason("t=abc,v1=00") == "invalid_signature_header_format"
+    assert reason(f"t={now},v1=not-hex") == "invalid_signature_header_format"
+    assert reason(_header("secret", body, now - 3600)) == "timestamp_out_of_tolerance"
+    assert reason(_header("other", body, now)) == "signature_mismatch"
+    assert reason(_header("secret", body + b" ", now)) == "signature_mismatch"
+
+
+def test_verify_calendly_signature_skipped_without_signing_key():
+    check = verify_calendly_signature(signing_key="", header_value=None, raw_body=b"{}")
+
+    assert check.ok
+    assert check.reason == "signing_key_not_set"
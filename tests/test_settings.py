@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import pytest
+
+from app.settings import Settings, get_settings
+
+_KEYS = ("DRY_RUN", "ALLOW_DEBUG_ENDPOINTS", "SCRAPER_MAX_PAGES", "ZOHO_DC", "BASE_URL", "ZOHO_OWNER_ID")
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    """Write a .env and return its path, with the real environment cleared for the keys under test."""
+    for key in _KEYS:
+        monkeypatch.delenv(key, raising=False)
+        monkeypatch.delenv(key.lower(), raising=False)
+
+    def write(text: str) -> str:
+        path = tmp_path / ".env"
+        path.write_text(text, encoding="utf-8")
+        return str(path)
+
+    return write
+
+
+@pytest.mark.parametrize("raw", ["1", "true", "True", "t", "YES", "y", "on"])
+def test_bool_true_spellings(env_file, raw):
+    assert Settings.from_env(env_file(f"ALLOW_DEBUG_ENDPOINTS={raw}\n")).ALLOW_DEBUG_ENDPOINTS is True
+
+
+@pytest.mark.parametrize("raw", ["0", "false", "FALSE", "f", "no", "n", "off"])
+def test_bool_false_spellings(env_file, raw):
+    assert Settings.from_env(env_file(f"DRY_RUN={raw}\n")).DRY_RUN is False
+
+
+def test_bad_bool_and_int_raise(env_file):
+    with pytest.raises(ValueError, match="SCRAPER_MAX_PAGES must be an integer"):
+        Settings.from_env(env_file("SCRAPER_MAX_PAGES=five\n"))
+    with pytest.raises(ValueError, match="DRY_RUN must be a boolean"):
+        Settings.from_env(env_file("DRY_RUN=maybe\n"))
+
+
+def test_int_is_parsed(env_file):
+    assert Settings.from_env(env_file("SCRAPER_MAX_PAGES= 12 \n")).SCRAPER_MAX_PAGES == 12
+
+
+def test_empty_bool_and_int_fall_back_to_defaults(env_file):
+    settings = Settings.from_env(env_file("DRY_RUN=\nSCRAPER_MAX_PAGES=  \nZOHO_OWNER_ID=\n"))
+    defaults = Settings()
+
+    assert settings.DRY_RUN is defaults.DRY_RUN
+    assert settings.SCRAPER_MAX_PAGES == defaults.SCRAPER_MAX_PAGES
+    assert settings.ZOHO_OWNER_ID == ""
+
+
+def test_env_var_wins_over_file(env_file, monkeypatch):
+    path = env_file("ZOHO_DC=eu\nDRY_RUN=true\n")
+    monkeypatch.setenv("ZOHO_DC", "us")
+    monkeypatch.setenv("dry_run", "false")
+
+    settings = Settings.from_env(path)
+
+    assert settings.ZOHO_DC == "us"
+    assert settings.DRY_RUN is False
+
+
+def test_quoted_commented_and_exported_values(env_file):
+    settings = Settings.from_env(
+        env_file(
+            "# comment line\n"
+            "\n"
+            'BASE_URL="https://example.com/#anchor"\n'
+            "ZOHO_OWNER_ID='123 # not a comment'\n"
+            "export ZOHO_DC=eu  # inline comment\n"
+            "scraper_max_pages=3\n"
+            "not a setting line\n"
+        )
+    )
+
+    assert settings.BASE_URL == "https://example.com/#anchor"
+    assert settings.ZOHO_OWNER_ID == "123 # not a comment"
+    assert settings.ZOHO_DC == "eu"
+    assert settings.SCRAPER_MAX_PAGES == 3
+
+
+def test_missing_env_file_uses_defaults(tmp_path, env_file):
+    settings = Settings.from_env(str(tmp_path / "missing.env"))
+
+    assert settings == Settings()
+
+
+def test_get_settings_is_cached_until_cache_clear(env_file, monkeypatch, tmp_path):
+    env_file("ZOHO_DC=eu\n")
+    monkeypatch.chdir(tmp_path)
+    get_settings.cache_clear()
+    try:
+        first = get_settings()
+        assert first.ZOHO_DC == "eu"
+        assert get_settings() is first
+
+        env_file("ZOHO_DC=in\n")
+        assert get_settings().ZOHO_DC == "eu"
+
+        get_settings.cache_clear()
+        assert get_settings().ZOHO_DC == "in"
+    finally:
+        get_settings.cache_clear()
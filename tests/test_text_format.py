@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from app.util.text_format import markdown_to_plain_text
+
+
+def test_markdown_to_plain_text_converts_headers_bold_and_bullets():
+    md = (
+        "## Summary\n"
+        "\n"
+        "\n"
+        "**Budget:** 10k\n"
+        "Some **short** and **a very long bold phrase that exceeds thirty chars** text\n"
+        "- item one\n"
+        "   - nested\n"
+        "\n"
+        "\n"
+        "### Next Steps\n"
+        "plain line\n"
+    )
+
+    out = markdown_to_plain_text(md)
+
+    assert out == (
+        "SUMMARY\n"
+        "=======\n"
+        "\n"
+        "Budget: 10k\n"
+        "Some SHORT and a very long bold phrase that exceeds thirty chars text\n"
+        "  • item one\n"
+        "  • nested\n"
+        "\n"
+        "NEXT STEPS\n"
+        "----------\n"
+        "plain line"
+    )